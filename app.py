@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
 from auth import AuthManager
 from data_manager import DataManager
 from config import ConfigManager
@@ -16,10 +16,16 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource(show_spinner=False)
+def _check_encryption():
+    """Build the cipher once per server process to validate the key (failures aren't cached)"""
+    from crypto_utils import DataEncryption
+    DataEncryption()
+    return True
+
 # Test encryption key and show helpful error message
 try:
-    from crypto_utils import DataEncryption
-    test_encryption = DataEncryption()
+    _check_encryption()
 except Exception as e:
     st.error("🔑 Encryption Key Problem!")
     st.write("**Error:**", str(e))
@@ -28,16 +34,38 @@ except Exception as e:
     st.write("Make sure the key is at least 8 characters long!")
     st.stop()
 
+@st.cache_resource(show_spinner=False)
+def get_config_manager():
+    """ConfigManager shared across reruns and sessions"""
+    return ConfigManager()
+
+@st.cache_resource(show_spinner=False)
+def get_auth_manager():
+    """AuthManager shared across reruns and sessions"""
+    return AuthManager(get_config_manager())
+
+@st.cache_resource(show_spinner=False)
+def get_data_manager():
+    """DataManager shared across reruns and sessions, along with its cipher and file cache"""
+    return DataManager(get_config_manager())
+
 # Initialize managers
-auth_manager = AuthManager()
-data_manager = DataManager()
-config_manager = ConfigManager()
+config_manager = get_config_manager()
+auth_manager = get_auth_manager()
+data_manager = get_data_manager()
+
+@st.cache_resource(show_spinner=False)
+def _initialize_users_once():
+    """Seed users/settings files once per server process rather than every rerun"""
+    return config_manager.initialize_users()
 
 # Initialize users file
 try:
-    users = config_manager.initialize_users()
+    users = _initialize_users_once()
     
     if not users:
+        # Don't keep an empty result around, retry on the next rerun
+        _initialize_users_once.clear()
         st.error("Failed to initialize users. Please check your encryption key.")
         st.stop()
         
@@ -49,16 +77,130 @@ except Exception as e:
     st.write("3. Try clicking the 'Reboot app' button in Streamlit Cloud")
     st.stop()
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_current_week():
+    """Current week number, reused across reruns until an admin changes it"""
+    return config_manager.get_current_week()
+
+def _cached_users():
+    """Users map, from the same cache the login checks use"""
+    return auth_manager.get_users()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_front_page_blurb():
+    """Front page blurb, reused across reruns until an admin edits it"""
+    return config_manager.get_front_page_blurb()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_predictions_open():
+    """Whether predictions are open, reused across reruns until an admin toggles it"""
+    return config_manager.are_predictions_open()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _file_exists(path):
+    """Local file existence check, reused for a few seconds across reruns"""
+    return os.path.exists(path)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_fixtures(week_num):
+    """Fixtures for a week, reused across reruns until an admin re-saves them"""
+    return data_manager.load_fixtures(week_num)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_results(week_num):
+    """Results for a week, reused across reruns until an admin re-saves them"""
+    return data_manager.load_results(week_num)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_user_predictions(week_num, username):
+    """A user's predictions for a week, reused across reruns until they resubmit"""
+    return data_manager.load_predictions(week_num, username)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_week_scores(week_num, usernames, results_sha, predictions_sha):
+    """Points per user for a completed week (and the files they came from)
+    
+    Keyed on the blob SHAs of the week's results and predictions files, so
+    any change to either - however it was made - is rescored. The SHAs come
+    from the same repo listing the reads are checked against.
+    calculate_week_scores raises if the week's files can't be read, so only
+    real scores (or a real "no results yet") are cached.
+    """
+    return data_manager.calculate_week_scores(week_num, list(usernames))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_leaderboard(current_week):
+    """Leaderboard for the given week, reused across reruns until scores change"""
+    # A fresh process can reuse the leaderboard stored in the repo if nothing changed;
+    # once this process has its own, get_leaderboard checks that without a GitHub read
+    if data_manager._leaderboard_memo is None:
+        leaderboard = data_manager.load_cached_leaderboard()
+        if leaderboard is not None:
+            return leaderboard
+    usernames = tuple(sorted(u for u in _cached_users() if u != "admin"))
+    try:
+        files = data_manager._list_repo_files()
+    except Exception as e:
+        # Without the listing there's nothing to key on, so get_leaderboard scores every week
+        print(f"Error listing repo files: {e}")
+        return data_manager.get_leaderboard()
+    
+    week_scores = {}
+    for week in range(1, current_week):
+        results_path = f"results/week{week}.csv"
+        if results_path not in files:
+            # Weeks without a results file score nothing, so skip fetching them
+            week_scores[week] = None
+            continue
+        try:
+            week_scores[week] = _cached_week_scores(week, usernames, files[results_path], files.get(f"predictions/week{week}.json"))
+        except Exception:
+            # Not cached - leave the week out so get_leaderboard retries it and reports the error
+            pass
+    return data_manager.get_leaderboard(week_scores)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_leaderboard_table(current_week):
+    """Leaderboard as the displayed DataFrame, so tab switches don't rebuild it"""
+    import pandas as pd
+    leaderboard = _cached_leaderboard(current_week)
+    return pd.DataFrame.from_records(
+        [
+            (pos, user["display_name"], user["total_points"], user["current_week_points"] if current_week > 1 else 0)
+            for pos, user in enumerate(leaderboard, 1)
+        ],
+        columns=["Pos", "Player", "Points", "Last Week"]
+    )
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_user_labels(current_week):
+    """Score-management select labels in leaderboard order"""
+    return [f"{user['display_name']} ({user['username']})" for user in _cached_leaderboard(current_week)]
+
+def _clear_leaderboard_caches():
+    """Drop the cached leaderboard and everything derived from it"""
+    _cached_leaderboard.clear()
+    _cached_leaderboard_table.clear()
+    _cached_user_labels.clear()
+
+def _users_changed():
+    """Drop everything derived from users.json after it's been written"""
+    auth_manager.clear_users_cache()
+    # Config writes bypass the data manager, so its repo listing would still show the
+    # old users.json sha and let a leaderboard without the change pass as current
+    data_manager.clear_cache(config_manager.users_file)
+    _clear_leaderboard_caches()
+
 def display_front_page_blurb():
     """Display admin-configured front page message"""
     try:
         # Try to load front page message from config
-        blurb = config_manager.get_front_page_blurb()
+        blurb = _cached_front_page_blurb()
         if blurb:
             st.info(blurb)
-    except:
-        # If no blurb exists, show default
-        pass
+    except Exception as e:
+        # Settings unreachable - show the page without a blurb
+        print(f"Error loading front page blurb: {e}")
 
 def main():
     # Check authentication
@@ -78,7 +220,7 @@ def main():
             auth_manager.logout()
     
     # Main content
-    current_week = config_manager.get_current_week()
+    current_week = _cached_current_week()
     
     # Title
     st.title("🏆 Premier League Predictions 2025-26")
@@ -101,56 +243,55 @@ def main():
     admin_tab = tabs[3] if auth_manager.is_admin() else None
     
     with tab1:
-        display_leaderboard()
+        display_leaderboard(current_week)
     
     with tab2:
         prediction_form(current_week, current_user['username'])
     
     with tab3:
-        view_user_predictions(current_user['username'])
+        view_user_predictions(current_user['username'], current_week)
 
     if admin_tab is not None:
         with admin_tab:
-            admin_page()
+            admin_page(current_week)
 
-def admin_page():
+def admin_page(current_week):
     """Main admin page content"""
     st.header("🛠️ Administrator Dashboard")
 
-    st.markdown("### Admin Controls")
-    admin_panel()
-
-    st.markdown("### User Management")
-    user_management_panel()
-
-    st.markdown("### Fixtures Management")
-    fixtures_management_panel()
-
-    st.markdown("### Score Management")
-    score_management_panel()
+    # Only the selected section runs, so other panels don't hit GitHub on every rerun
+    sections = {
+        "Admin Controls": lambda: admin_panel(current_week),
+        "User Management": user_management_panel,
+        "Fixtures Management": lambda: fixtures_management_panel(current_week),
+        "Score Management": lambda: score_management_panel(current_week),
+        "Results Management": lambda: results_management_panel(current_week),
+        "Prediction Export": lambda: prediction_export_panel(current_week),
+        "Front Page Settings": front_page_management_panel,
+        "Debug Info": debug_info_panel
+    }
+    section = st.sidebar.radio("Admin section", list(sections), key="admin_section")
 
-    st.markdown("### Results Management")
-    results_management_panel()
-
-    st.markdown("### Prediction Export")
-    prediction_export_panel()
-
-    st.markdown("### Front Page Settings")
-    front_page_management_panel()
+    st.markdown(f"### {section}")
+    sections[section]()
 
+def debug_info_panel():
+    """Admin panel with users file and GitHub configuration checks"""
     with st.expander("🔧 Debug Info"):
         if st.button("Reset Users File"):
-            if os.path.exists("users.json"):
+            if _file_exists("users.json"):
                 os.remove("users.json")
+                _file_exists.clear()
             config_manager.initialize_users()
+            _users_changed()
             st.success("Users file reset!")
             st.rerun()
 
         st.write("File status:")
-        st.write(f"users.json exists: {os.path.exists('users.json')}")
+        st.write(f"users.json exists: {_file_exists('users.json')}")
 
         try:
-            users = config_manager.get_users()
+            users = _cached_users()
             st.write(f"Users loaded: {len(users)} users")
             if "admin" in users:
                 st.write("✅ Admin user found")
@@ -161,9 +302,10 @@ def admin_page():
 
         st.write("**GitHub Configuration:**")
         try:
-            github_token = data_manager._get_secret('GITHUB_TOKEN')
-            github_repo_owner = data_manager._get_secret('GITHUB_REPO_OWNER')
-            github_repo_name = data_manager._get_secret('GITHUB_REPO_NAME')
+            # Resolved once when the data manager was created
+            github_token = data_manager.github_token
+            github_repo_owner = data_manager.repo_owner
+            github_repo_name = data_manager.repo_name
 
             st.write(f"GITHUB_TOKEN: {'✅ Set' if github_token else '❌ Not set'}")
             st.write(f"GITHUB_REPO_OWNER: {'✅ ' + github_repo_owner if github_repo_owner else '❌ Not set'}")
@@ -179,7 +321,8 @@ def admin_page():
 
         if st.button("Test GitHub Connection"):
             try:
-                test_result = data_manager._get_file_from_github("settings.json")
+                # max_age=0 so this always goes to GitHub rather than the file cache
+                test_result = data_manager._get_file_from_github("settings.json", max_age=0)
                 if test_result[0] is not None:
                     st.success("✅ GitHub connection successful!")
                 else:
@@ -187,19 +330,22 @@ def admin_page():
             except Exception as e:
                 st.error(f"❌ GitHub connection failed: {e}")
 
-def admin_panel():
+def admin_panel(current_week):
     """Admin control panel"""
     st.markdown("#### Week Management")
-    current_week = config_manager.get_current_week()
     
-    new_week = st.number_input("Set Current Week", 
-                              min_value=1, 
-                              max_value=38, 
-                              value=current_week)
+    # Forms so typing a value doesn't rerun the whole admin page until submitted
+    with st.form("week_form"):
+        new_week = st.number_input("Set Current Week", 
+                                  min_value=1, 
+                                  max_value=38, 
+                                  value=current_week)
+        update_week = st.form_submit_button("Update Week")
     
-    if st.button("Update Week"):
+    if update_week:
         old_week = current_week
         config_manager.set_current_week(new_week)
+        _cached_current_week.clear()
         st.success(f"Week updated from {old_week} to {new_week}")
         
         # Show information about leaderboard recalculation
@@ -211,20 +357,23 @@ def admin_panel():
         st.rerun()
     
     st.markdown("#### Prediction Settings")
-    predictions_open = config_manager.are_predictions_open()
+    predictions_open = _cached_predictions_open()
     
-    new_predictions_status = st.checkbox("Accept Predictions", value=predictions_open)
+    with st.form("prediction_settings_form"):
+        new_predictions_status = st.checkbox("Accept Predictions", value=predictions_open)
+        update_settings = st.form_submit_button("Update Prediction Settings")
     
-    if st.button("Update Prediction Settings"):
+    if update_settings:
         config_manager.set_predictions_open(new_predictions_status)
+        _cached_predictions_open.clear()
         status_text = "open" if new_predictions_status else "closed"
         st.success(f"Predictions are now {status_text}")
         st.rerun()
     
     st.markdown("#### File Status")
     # Check what files exist in GitHub (not local files)
-    fixtures_exist = data_manager.load_fixtures(current_week) is not None
-    results_exist = data_manager.load_results(current_week) is not None
+    fixtures_exist = current_week in data_manager.list_existing("fixtures")
+    results_exist = current_week in data_manager.results_weeks()
     
     st.write(f"Week {current_week} fixtures: {'✅' if fixtures_exist else '❌'}")
     st.write(f"Week {current_week} results: {'✅' if results_exist else '❌'}")
@@ -236,10 +385,7 @@ def admin_panel():
         st.write(f"📊 Current leaderboard includes completed weeks: 1 to {current_week - 1}")
         
         # Check how many weeks have results
-        completed_weeks = 0
-        for week in range(1, current_week):
-            if data_manager.load_results(week) is not None:
-                completed_weeks += 1
+        completed_weeks = len(data_manager.results_weeks() & set(range(1, current_week)))
         
         st.write(f"📈 Weeks with results uploaded: {completed_weeks} out of {current_week - 1}")
     else:
@@ -252,7 +398,7 @@ def user_management_panel():
         
         # Show current users
         try:
-            users = config_manager.get_users()
+            users = _cached_users()
             for username, data in users.items():
                 admin_badge = " 👑" if data.get('is_admin') else ""
                 st.write(f"**{data['display_name']}** ({username}){admin_badge}")
@@ -270,6 +416,7 @@ def user_management_panel():
                 if new_username and new_passcode and new_display_name:
                     try:
                         config_manager.add_user(new_username, new_passcode, new_display_name, is_admin)
+                        _users_changed()
                         st.success(f"Added user: {new_display_name}")
                         st.rerun()
                     except Exception as e:
@@ -277,11 +424,9 @@ def user_management_panel():
                 else:
                     st.warning("Please fill in all fields")
 
-def results_management_panel():
+def results_management_panel(current_week):
     """Admin panel to input results and generate results files"""
     with st.expander("📊 Input Match Results"):
-        current_week = config_manager.get_current_week()
-        
         # Week selector
         selected_week = st.selectbox(
             "Select week to input results:", 
@@ -290,13 +435,13 @@ def results_management_panel():
         )
         
         # Check if fixtures exist for selected week
-        fixtures = data_manager.load_fixtures(selected_week)
+        fixtures = _cached_fixtures(selected_week)
         if fixtures is None:
             st.error(f"No fixtures found for week {selected_week}")
             return
         
         # Check if results already exist
-        existing_results = data_manager.load_results(selected_week)
+        existing_results = _cached_results(selected_week)
         results_exist = existing_results is not None
         
         if results_exist:
@@ -313,49 +458,54 @@ def results_management_panel():
             with st.form(f"results_form_week_{selected_week}"):
                 st.write(f"**Input results for Week {selected_week}:**")
                 
-                results_data = []
-                
-                for i, (_, fixture) in enumerate(fixtures.iterrows()):
-                    st.markdown(f"**{fixture['home_team']} vs {fixture['away_team']}**")
-                    
-                    # Get existing results if available
-                    existing_home = 0
-                    existing_away = 0
-                    if results_exist and i < len(existing_results):
-                        existing_home = existing_results.iloc[i]['home_score']
-                        existing_away = existing_results.iloc[i]['away_score']
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        home_score = st.number_input(
-                            f"{fixture['home_team']}:", 
-                            min_value=0, max_value=20, 
-                            value=int(existing_home), 
-                            key=f"result_home_{selected_week}_{i}"
-                        )
-                    with col2:
-                        away_score = st.number_input(
-                            f"{fixture['away_team']}:", 
-                            min_value=0, max_value=20, 
-                            value=int(existing_away), 
-                            key=f"result_away_{selected_week}_{i}"
+                # Existing scores keyed by fixture so a reordered file still lines up
+                existing_scores = {}
+                if results_exist:
+                    existing_scores = {
+                        (home_team, away_team): (home_score, away_score)
+                        for home_team, away_team, home_score, away_score in zip(
+                            existing_results['home_team'].tolist(), existing_results['away_team'].tolist(),
+                            existing_results['home_score'].tolist(), existing_results['away_score'].tolist()
                         )
-                    
-                    results_data.append({
-                        'home_team': fixture['home_team'],
-                        'away_team': fixture['away_team'],
-                        'home_score': home_score,
-                        'away_score': away_score
-                    })
+                    }
+                
+                import pandas as pd
+                home_teams = fixtures['home_team'].tolist()
+                away_teams = fixtures['away_team'].tolist()
+                scores = [existing_scores.get(fixture, (0, 0)) for fixture in zip(home_teams, away_teams)]
+                results_grid = pd.DataFrame({
+                    'home_team': home_teams,
+                    'home_score': [int(home) for home, _ in scores],
+                    'away_score': [int(away) for _, away in scores],
+                    'away_team': away_teams
+                })
+                
+                edited_results = st.data_editor(
+                    results_grid,
+                    use_container_width=True,
+                    hide_index=True,
+                    num_rows="fixed",
+                    disabled=['home_team', 'away_team'],
+                    column_config={
+                        'home_team': "Home",
+                        'home_score': st.column_config.NumberColumn("Home Score", min_value=0, max_value=20, step=1, required=True),
+                        'away_score': st.column_config.NumberColumn("Away Score", min_value=0, max_value=20, step=1, required=True),
+                        'away_team': "Away"
+                    },
+                    key=f"results_grid_{selected_week}"
+                )
                 
                 if st.form_submit_button("Save Results"):
                     try:
-                        # Create results DataFrame
-                        results_df = pd.DataFrame(results_data)
+                        # Keep the stored column order and plain integer scores
+                        results_df = edited_results[['home_team', 'away_team', 'home_score', 'away_score']].copy()
+                        results_df[['home_score', 'away_score']] = results_df[['home_score', 'away_score']].fillna(0).astype(int)
                         
                         # Save results using data manager (saves to GitHub)
                         with st.spinner("Saving results to GitHub..."):
                             data_manager.save_results(selected_week, results_df)
+                        _cached_results.clear()
+                        _clear_leaderboard_caches()
                         
                         st.success(f"✅ Results saved for week {selected_week}!")
                         st.rerun()
@@ -369,23 +519,22 @@ def results_management_panel():
                         else:
                             st.error("Please check your GitHub configuration in Streamlit secrets.")
 
-def fixtures_management_panel():
+def fixtures_management_panel(current_week):
     """Admin panel to input fixtures and save to GitHub"""
     with st.expander("🗓️ Manage Fixtures"):
-        current_week = config_manager.get_current_week()
-
         selected_week = st.selectbox(
             "Select week to manage fixtures:",
             range(1, 39),
             index=current_week - 1
         )
 
-        existing_fixtures = data_manager.load_fixtures(selected_week)
+        existing_fixtures = _cached_fixtures(selected_week)
         if existing_fixtures is not None and not existing_fixtures.empty:
             st.info(f"Fixtures already exist for week {selected_week}. You can edit and re-save.")
             fixtures_df = existing_fixtures.copy()
         else:
             st.write("No fixtures found for this week. Add them below.")
+            import pandas as pd
             fixtures_df = pd.DataFrame(
                 {
                     "home_team": [""] * 10,
@@ -422,25 +571,26 @@ def fixtures_management_panel():
                     return
 
                 data_manager.save_fixtures(selected_week, cleaned)
+                _cached_fixtures.clear()
                 st.success(f"Fixtures saved for week {selected_week}!")
             except Exception as e:
                 st.error(f"Error saving fixtures: {e}")
 
-def score_management_panel():
+def score_management_panel(current_week):
     """Admin panel to manually adjust user scores"""
     with st.expander("🔢 Manual Score Management"):
         st.subheader("Adjust User Scores")
         
         try:
             # Get current leaderboard
-            leaderboard = data_manager.get_leaderboard()
+            leaderboard = _cached_leaderboard(current_week)
             
             if not leaderboard:
                 st.info("No users with scores yet.")
                 return
             
             # Select user
-            user_options = [f"{user['display_name']} ({user['username']})" for user in leaderboard]
+            user_options = _cached_user_labels(current_week)
             selected_user_idx = st.selectbox("Select User", range(len(user_options)), 
                                            format_func=lambda x: user_options[x])
             
@@ -453,10 +603,13 @@ def score_management_panel():
                 
                 # Show weekly breakdown
                 if selected_user['weekly_breakdown']:
+                    import pandas as pd
                     st.write("**Weekly Breakdown:**")
-                    for week, points in selected_user['weekly_breakdown'].items():
-                        week_num = week.replace("week_", "")
-                        st.write(f"Week {week_num}: {points} points")
+                    # One table instead of a line per week
+                    breakdown = pd.Series(selected_user['weekly_breakdown'], name="Points")
+                    breakdown.index = breakdown.index.str.replace("week_", "", regex=False).astype(int)
+                    breakdown.index.name = "Week"
+                    st.dataframe(breakdown.sort_index().to_frame(), use_container_width=True)
                 
                 st.markdown("---")
                 
@@ -488,6 +641,7 @@ def score_management_panel():
                                 )
                                 
                                 if success:
+                                    _clear_leaderboard_caches()
                                     st.success(f"Successfully adjusted {selected_user['display_name']}'s score by {actual_change} points!")
                                     st.info(f"Reason: {reason}")
                                     st.rerun()
@@ -519,6 +673,7 @@ def score_management_panel():
                                 )
                                 
                                 if success:
+                                    _clear_leaderboard_caches()
                                     st.success(f"Successfully set {selected_user['display_name']}'s score to {new_total} points!")
                                     st.info(f"Reason: {reason}")
                                     st.rerun()
@@ -542,133 +697,13 @@ def score_management_panel():
         except Exception as e:
             st.error(f"Error in score management: {e}")
 
-def prediction_export_panel():
-    """Admin panel to export predictions as spreadsheet"""
-    with st.expander("📊 Export Predictions"):
-        st.subheader("Download Unencrypted Predictions")
-        
-        current_week = config_manager.get_current_week()
-        
-        # Week selector for export
-        available_weeks = []
-        for week in range(1, current_week + 1):
-            predictions = data_manager.load_predictions(week)
-            if predictions:
-                available_weeks.append(week)
-        
-        if not available_weeks:
-            st.info("No predictions available for export yet.")
-            return
-        
-        selected_weeks = st.multiselect("Select weeks to export", 
-                                       available_weeks, 
-                                       default=available_weeks)
-        
-        export_format = st.radio("Export Format", ["CSV", "Excel"])
-        
-        if st.button("Generate Export"):
-            try:
-                # Create export data
-                export_data = []
-                users = config_manager.get_users()
-                
-                for week in selected_weeks:
-                    predictions = data_manager.load_predictions(week)
-                    fixtures = data_manager.load_fixtures(week)
-                    results = data_manager.load_results(week)
-                    
-                    if not predictions or fixtures is None:
-                        continue
-                    
-                    for username, pred_data in predictions.items():
-                        if username == "admin":
-                            continue
-                            
-                        # Handle both old and new prediction formats
-                        if isinstance(pred_data, dict) and "predictions" in pred_data:
-                            user_predictions = pred_data["predictions"]
-                            submitted_at = pred_data.get("submitted_at", "")
-                        else:
-                            user_predictions = pred_data
-                            submitted_at = ""
-                        
-                        user_info = users.get(username, {})
-                        display_name = user_info.get("display_name", username)
-                        
-                        for i, prediction in enumerate(user_predictions):
-                            if i < len(fixtures):
-                                fixture = fixtures.iloc[i]
-                                
-                                # Get actual result if available
-                                actual_home = actual_away = ""
-                                if results is not None and i < len(results):
-                                    result_row = results.iloc[i]
-                                    actual_home = result_row.get('home_score', '')
-                                    actual_away = result_row.get('away_score', '')
-                                
-                                export_data.append({
-                                    'Week': week,
-                                    'Username': username,
-                                    'Display_Name': display_name,
-                                    'Home_Team': fixture['home_team'],
-                                    'Away_Team': fixture['away_team'],
-                                    'Predicted_Home': prediction.get('home_score', ''),
-                                    'Predicted_Away': prediction.get('away_score', ''),
-                                    'Actual_Home': actual_home,
-                                    'Actual_Away': actual_away,
-                                    'Submitted_At': submitted_at
-                                })
-                
-                if export_data:
-                    import pandas as pd
-                    df = pd.DataFrame(export_data)
-                    
-                    if export_format == "CSV":
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            label="Download CSV",
-                            data=csv,
-                            file_name=f"predictions_weeks_{'-'.join(map(str, selected_weeks))}.csv",
-                            mime='text/csv'
-                        )
-                    else:  # Excel
-                        from io import BytesIO
-                        output = BytesIO()
-                        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                            df.to_excel(writer, index=False, sheet_name='Predictions')
-                        
-                        st.download_button(
-                            label="Download Excel",
-                            data=output.getvalue(),
-                            file_name=f"predictions_weeks_{'-'.join(map(str, selected_weeks))}.xlsx",
-                            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                        )
-                    
-                    st.success(f"Export ready! {len(export_data)} prediction records found.")
-                    
-                    # Show preview
-                    st.subheader("Preview (First 10 rows)")
-                    st.dataframe(df.head(10))
-                    
-                else:
-                    st.warning("No prediction data found for selected weeks.")
-                    
-            except Exception as e:
-                st.error(f"Error generating export: {e}")
-
-def prediction_export_panel():
+def prediction_export_panel(current_week):
     """Admin panel to export predictions to Excel"""
     with st.expander("📊 Export Predictions"):
         st.subheader("Export Predictions to Excel")
         
-        current_week = config_manager.get_current_week()
-        
         # Week selector for export
-        available_weeks = []
-        for week in range(1, current_week + 1):
-            predictions = data_manager.load_predictions(week)
-            if predictions:  # Only show weeks that have predictions
-                available_weeks.append(week)
+        available_weeks = sorted(data_manager.list_existing("predictions") & set(range(1, current_week + 1)))
         
         if not available_weeks:
             st.info("No weeks with predictions available for export.")
@@ -706,7 +741,8 @@ def prediction_export_panel():
                         
                         # Show preview
                         predictions = data_manager.load_predictions(selected_week)
-                        st.write(f"**Preview:** {len(predictions)} users made predictions for week {selected_week}")
+                        user_count = sum(1 for username in predictions if username != "admin")
+                        st.write(f"**Preview:** {user_count} users made predictions for week {selected_week}")
                         
                     else:
                         st.error("Failed to create Excel file.")
@@ -717,9 +753,14 @@ def prediction_export_panel():
         with col2:
             # Show current week status
             st.write("**Week Status:**")
-            for week in available_weeks[-5:]:  # Show last 5 weeks
+            recent_weeks = available_weeks[-5:]  # Show last 5 weeks
+            # Each week is a separate GitHub read, so fetch them concurrently, then
+            # decrypt on this thread from the warm cache so st.error still shows
+            with ThreadPoolExecutor(max_workers=len(recent_weeks)) as executor:
+                list(executor.map(data_manager._prefetch, [f"predictions/week{week}.json" for week in recent_weeks]))
+            for week in recent_weeks:
                 predictions = data_manager.load_predictions(week)
-                user_count = len([u for u in predictions.keys() if u != "admin"])
+                user_count = sum(1 for username in predictions if username != "admin")
                 st.write(f"Week {week}: {user_count} predictions")
 
 def front_page_management_panel():
@@ -729,8 +770,9 @@ def front_page_management_panel():
         
         # Get current blurb
         try:
-            current_blurb = config_manager.get_front_page_blurb()
-        except:
+            current_blurb = _cached_front_page_blurb()
+        except Exception as e:
+            st.warning(f"Could not load the current message: {e}")
             current_blurb = ""
 
         if "front_page_blurb_draft" not in st.session_state:
@@ -753,6 +795,7 @@ def front_page_management_panel():
         if save_clicked:
             try:
                 config_manager.set_front_page_blurb(new_blurb)
+                _cached_front_page_blurb.clear()
                 st.success("Front page message updated!")
             except Exception as e:
                 st.error(f"Error saving message: {e}")
@@ -760,6 +803,7 @@ def front_page_management_panel():
         if clear_clicked:
             try:
                 config_manager.set_front_page_blurb("")
+                _cached_front_page_blurb.clear()
                 st.session_state.front_page_blurb_draft = ""
                 st.success("Front page message cleared!")
             except Exception as e:
@@ -770,100 +814,109 @@ def front_page_management_panel():
             st.write("**Preview:**")
             st.info(st.session_state.front_page_blurb_draft)
 
-def display_leaderboard():
+def display_leaderboard(current_week):
     """Display the leaderboard"""
     st.subheader("🏆 Leaderboard")
     
-    leaderboard = data_manager.get_leaderboard()
+    leaderboard = _cached_leaderboard(current_week)
     
     if not leaderboard:
         st.info("No scores yet! Either it is week 1 or Ana has fucked up.")
         
         # Show current status
-        current_week = config_manager.get_current_week()
         st.write(f"**Current Status:** Week {current_week}")
         
         # Show who has made predictions for current week
         predictions = data_manager.load_predictions(current_week)
-        if predictions:
+        predicted_users = [username for username in predictions if username != "admin"]
+        if predicted_users:
             st.write(f"**Users who have predicted for Week {current_week}:**")
-            for username in predictions.keys():
-                if username != "admin":
-                    user_info = config_manager.get_users().get(username, {})
-                    display_name = user_info.get("display_name", username)
-                    st.write(f"✅ {display_name}")
+            users = _cached_users()
+            lines = [f"✅ {users.get(username, {}).get('display_name', username)}" for username in predicted_users]
+            st.markdown("\n\n".join(lines))
         else:
             st.write("No predictions submitted yet for the current week.")
         
         return
     
     # Create leaderboard dataframe
-    df_data = []
-    current_week = config_manager.get_current_week()
-    
-    for i, user in enumerate(leaderboard):
-        df_data.append({
-            "Pos": i + 1,
-            "Player": user["display_name"],
-            "Points": user["total_points"],
-            "Last Week": user["current_week_points"] if current_week > 1 else 0
-        })
-    
-    df = pd.DataFrame(df_data)
+    df = _cached_leaderboard_table(current_week)
     
     # Display leaderboard with better mobile formatting
     st.dataframe(df, use_container_width=True, hide_index=True)
     
     # Show top 3 with medals
     if len(leaderboard) >= 3:
-        st.markdown("### 🏆 Top 3")
         medals = ["🥇", "🥈", "🥉"]
-        for i in range(min(3, len(leaderboard))):
-            user = leaderboard[i]
-            st.markdown(f"{medals[i]} **{user['display_name']}** - {user['total_points']} points")
+        top3_lines = [
+            f"{medal} **{user['display_name']}** - {user['total_points']} points"
+            for medal, user in zip(medals, leaderboard)
+        ]
+        st.markdown("### 🏆 Top 3\n\n" + "\n\n".join(top3_lines))
     
     # Show weekly breakdown for top 3
     if len(leaderboard) > 0:
         st.subheader("📈 Weekly Breakdown")
         
-        for i, user in enumerate(leaderboard[:3]):
-            with st.expander(f"{i+1}. {user['display_name']} - {user['total_points']} points"):
-                breakdown = user["weekly_breakdown"]
-                if breakdown:
-                    # Simple text breakdown instead of chart for mobile compatibility
-                    for week, points in breakdown.items():
-                        week_num = week.replace("week_", "")
-                        st.write(f"Week {week_num}: {points} points")
-                else:
-                    st.write("No completed weeks yet")
+        # One table of week x player instead of an expander per player
+        import pandas as pd
+        breakdown_df = pd.DataFrame({
+            f"{i+1}. {user['display_name']}": {
+                int(week.replace("week_", "")): points
+                for week, points in user["weekly_breakdown"].items()
+            }
+            for i, user in enumerate(leaderboard[:3])
+        }).sort_index()
+        
+        if breakdown_df.empty:
+            st.write("No completed weeks yet")
+        else:
+            breakdown_df.index.name = "Week"
+            # Table rather than chart for mobile compatibility
+            st.dataframe(breakdown_df, use_container_width=True)
 
 def prediction_form(week_num, username):
     st.subheader(f"⚽ Week {week_num} Predictions")
+    # Set just before the rerun that follows a successful save
+    if st.session_state.pop("predictions_saved", False):
+        st.success("Predictions submitted successfully!")
     
     # Check if predictions are open
-    if not config_manager.are_predictions_open():
+    if not _cached_predictions_open():
         st.error("🔒 Predictions are currently closed!")
         st.info("Contact the admin if you think this is a mistake.")
         return
     
-    fixtures = data_manager.load_fixtures(week_num)
+    fixtures = _cached_fixtures(week_num)
     if fixtures is None:
         st.error(f"Fixtures for week {week_num} not found! Please contact admin.")
         return
 
-    has_predicted = data_manager.has_user_predicted(username, week_num)
-    edit_mode = st.session_state.get("edit_predictions", False)
+    # Load once and reuse for both the summary and the edit form defaults
+    existing_predictions = _cached_user_predictions(week_num, username)
+    has_predicted = len(existing_predictions) > 0
+    existing_scores = {
+        (pred.get('home_team'), pred.get('away_team')): (pred['home_score'], pred['away_score'])
+        for pred in existing_predictions
+    }
+    st.session_state.setdefault("edit_predictions", False)
+    edit_mode = st.session_state.edit_predictions
 
     # If user has predicted and is NOT editing, show predictions + edit button
     if has_predicted and not edit_mode:
         st.info("You have already submitted predictions for this week!")
 
-        existing_predictions = data_manager.load_predictions(week_num, username)
         st.subheader("Your Current Predictions:")
-        for i, (_, fixture) in enumerate(fixtures.iterrows()):
-            if i < len(existing_predictions):
-                pred = existing_predictions[i]
-                st.write(f"⚽ **{fixture['home_team']} {pred['home_score']}-{pred['away_score']} {fixture['away_team']}**")
+        import pandas as pd
+        predicted_fixtures = [
+            fixture for fixture in zip(fixtures['home_team'].tolist(), fixtures['away_team'].tolist())
+            if fixture in existing_scores
+        ]
+        st.dataframe(pd.DataFrame({
+            "Home": [home_team for home_team, _ in predicted_fixtures],
+            "Score": [f"{existing_scores[fixture][0]}-{existing_scores[fixture][1]}" for fixture in predicted_fixtures],
+            "Away": [away_team for _, away_team in predicted_fixtures]
+        }), use_container_width=True, hide_index=True)
 
         st.markdown("---")
         if st.button("Edit Predictions"):
@@ -875,48 +928,63 @@ def prediction_form(week_num, username):
     with st.form("predictions_form"):
         st.write("Make your predictions for this week's fixtures:")
 
-        predictions = []
-        existing_predictions = data_manager.load_predictions(week_num, username) if edit_mode else []
-
-        for i, (_, fixture) in enumerate(fixtures.iterrows()):
-            existing_home = existing_predictions[i]['home_score'] if i < len(existing_predictions) else 0
-            existing_away = existing_predictions[i]['away_score'] if i < len(existing_predictions) else 0
-
-            home_score = st.number_input(
-                f"{fixture['home_team']}:",
-                min_value=0, max_value=10,
-                value=existing_home,
-                key=f"home_{i}"
-            )
-            away_score = st.number_input(
-                f"{fixture['away_team']}:",
-                min_value=0, max_value=10,
-                value=existing_away,
-                key=f"away_{i}"
-            )
-
-            predictions.append({
-                "home_team": fixture['home_team'],
-                "away_team": fixture['away_team'],
-                "home_score": home_score,
-                "away_score": away_score
-            })
-            st.markdown("---")
+        home_teams = fixtures['home_team'].tolist()
+        away_teams = fixtures['away_team'].tolist()
+        
+        # One editable grid for the whole week instead of two inputs per fixture
+        import pandas as pd
+        defaults = [existing_scores.get(fixture, (0, 0)) for fixture in zip(home_teams, away_teams)]
+        prediction_grid = pd.DataFrame({
+            "Home": home_teams,
+            "Home Score": [home for home, _ in defaults],
+            "Away Score": [away for _, away in defaults],
+            "Away": away_teams
+        })
+        
+        edited_grid = st.data_editor(
+            prediction_grid,
+            use_container_width=True,
+            hide_index=True,
+            num_rows="fixed",
+            disabled=["Home", "Away"],
+            column_config={
+                "Home Score": st.column_config.NumberColumn(min_value=0, max_value=10, step=1, required=True),
+                "Away Score": st.column_config.NumberColumn(min_value=0, max_value=10, step=1, required=True)
+            },
+            key=f"predictions_grid_{week_num}"
+        )
 
         if st.form_submit_button("Submit Predictions" if not edit_mode else "Update Predictions"):
-            data_manager.save_predictions(username, week_num, predictions)
-            st.success("Predictions submitted successfully!")
-            if "edit_predictions" in st.session_state:
-                del st.session_state.edit_predictions
+            # Cast to plain ints so the scores serialize as numbers, not numpy types
+            predictions = [
+                {
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "home_score": int(home_score) if pd.notna(home_score) else 0,
+                    "away_score": int(away_score) if pd.notna(away_score) else 0
+                }
+                for home_team, away_team, home_score, away_score in zip(
+                    home_teams, away_teams,
+                    edited_grid["Home Score"].tolist(), edited_grid["Away Score"].tolist()
+                )
+            ]
+            with st.spinner("Saving your predictions..."):
+                saved = data_manager.save_predictions(username, week_num, predictions)
+            if not saved:
+                # save_predictions has already shown the error
+                return
+            
+            _cached_user_predictions.clear()
+            _clear_leaderboard_caches()
+            st.session_state.edit_predictions = False
+            st.session_state.predictions_saved = True
             st.rerun()
 
 
-def view_user_predictions(username):
+def view_user_predictions(username, current_week):
     """Display user's predictions for any given week"""
     st.subheader("📜 Your Prediction History")
     
-    current_week = config_manager.get_current_week()
-    
     # Week selector
     selected_week = st.selectbox(
         "Select Week to View:",
@@ -924,64 +992,62 @@ def view_user_predictions(username):
         index=current_week - 1 if current_week > 1 else 0
     )
     
-    # Get user's predictions for the selected week
-    user_predictions = data_manager.get_user_predictions_for_week(username, selected_week)
+    # Get user's predictions for the selected week, paired with fixtures
+    # (same cached loads as the prediction form, so no extra decrypt)
+    predictions = _cached_user_predictions(selected_week, username)
+    fixtures = _cached_fixtures(selected_week)
     
-    if user_predictions is None:
+    if not predictions or fixtures is None:
         st.info(f"No predictions found for Week {selected_week}")
         return
     
-    if not user_predictions:
-        st.info(f"You haven't made predictions for Week {selected_week} yet")
-        return
+    user_predictions = [
+        {
+            "home_team": home_team,
+            "away_team": away_team,
+            "predicted_home_score": pred['home_score'],
+            "predicted_away_score": pred['away_score']
+        }
+        for home_team, away_team, pred in zip(fixtures['home_team'].tolist(), fixtures['away_team'].tolist(), predictions)
+    ]
     
     st.subheader(f"Your Predictions for Week {selected_week}")
     
-    # Display predictions in a nice format
-    for pred in user_predictions:
-        col1, col2, col3 = st.columns([3, 1, 3])
-        
-        with col1:
-            st.write(f"**{pred['home_team']}**")
-        
-        with col2:
-            st.write(f"**{pred['predicted_home_score']}-{pred['predicted_away_score']}**")
-        
-        with col3:
-            st.write(f"**{pred['away_team']}**")
+    # Display predictions as one table
+    import pandas as pd
+    st.dataframe(pd.DataFrame({
+        "Home": [pred['home_team'] for pred in user_predictions],
+        "Score": [f"{pred['predicted_home_score']}-{pred['predicted_away_score']}" for pred in user_predictions],
+        "Away": [pred['away_team'] for pred in user_predictions]
+    }), use_container_width=True, hide_index=True)
     
     # Check if results are available for this week
-    results = data_manager.load_results(selected_week)
+    results = _cached_results(selected_week)
     if results is not None and len(results) > 0:
         st.markdown("---")
         st.subheader(f"Actual Results for Week {selected_week}")
         
+        result_rows = []
         total_points = 0
-        for i, (_, result) in enumerate(results.iterrows()):
-            if i < len(user_predictions):
-                pred = user_predictions[i]
-                
-                # Calculate points for this match
-                prediction_data = {
-                    'home_score': pred['predicted_home_score'],
-                    'away_score': pred['predicted_away_score']
-                }
-                points = data_manager.calculate_points(prediction_data, result)
-                total_points += points
-                
-                col1, col2, col3, col4 = st.columns([3, 1, 3, 1])
-                
-                with col1:
-                    st.write(f"{result['home_team']}")
-                
-                with col2:
-                    st.write(f"**{int(result['home_score'])}-{int(result['away_score'])}**")
-                
-                with col3:
-                    st.write(f"{result['away_team']}")
-                
-                with col4:
-                    st.write(f"**{points} pts**")
+        # Plain records rather than a pandas Series per row
+        for result, pred in zip(results[['home_team', 'away_team', 'home_score', 'away_score']].to_dict('records'), user_predictions):
+            # Calculate points for this match
+            prediction_data = {
+                'home_score': pred['predicted_home_score'],
+                'away_score': pred['predicted_away_score']
+            }
+            points = data_manager.calculate_points(prediction_data, result)
+            total_points += points
+            
+            result_rows.append((
+                result['home_team'],
+                f"{int(result['home_score'])}-{int(result['away_score'])}",
+                result['away_team'],
+                points
+            ))
+        
+        st.dataframe(pd.DataFrame.from_records(result_rows, columns=["Home", "Score", "Away", "Points"]),
+                     use_container_width=True, hide_index=True)
         
         st.markdown("---")
         st.write(f"**Total Points for Week {selected_week}: {total_points}**")
@@ -1,22 +1,59 @@
+import hashlib
+import secrets
 import streamlit as st
-import sys
-import os
 from config import verify_passcode
 
-# Ensure proper imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Successful logins this process has already checked, keyed by
+# (username, stored hash, keyed digest of the passcode). PBKDF2 is slow by
+# design, so repeat logins skip it; failures are never remembered.
+_verified_logins = set()
+_VERIFIED_LOGINS_MAX = 256
+_login_digest_key = secrets.token_bytes(16)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_users(_config):
+    """Users map shared by login checks and the app until a user is added
+    
+    Raises rather than returning an empty map when users.json can't be read
+    (or has no users), so a transient failure isn't cached.
+    """
+    users, _ = _config.get_users_with_sha()
+    if not users:
+        raise ValueError("No users found in users.json")
+    return users
+
+def _check_passcode(username, passcode, stored):
+    """verify_passcode, remembering successful checks for this process"""
+    digest = hashlib.blake2b(passcode.encode("utf-8"), key=_login_digest_key, digest_size=16).digest()
+    token = (username, stored, digest)
+    if token in _verified_logins:
+        return True
+    if not verify_passcode(passcode, stored):
+        return False
+    if len(_verified_logins) >= _VERIFIED_LOGINS_MAX:
+        _verified_logins.clear()
+    _verified_logins.add(token)
+    return True
 
 class AuthManager:
-    def __init__(self):
+    def __init__(self, config=None):
         # Import here to avoid circular imports
         from config import ConfigManager
-        self.config = ConfigManager()
+        self.config = config or ConfigManager()
+    
+    def get_users(self):
+        """Users map, cached across sessions and reruns ({} if it can't be loaded)"""
+        try:
+            return _cached_users(self.config)
+        except Exception as e:
+            print(f"Error loading users: {e}")
+            return {}
     
     def authenticate_user(self, username, passcode):
         """Authenticate user credentials"""
         try:
-            users = self.config.get_users()
-            if username in users and verify_passcode(passcode, users[username]["passcode"]):
+            users = _cached_users(self.config)
+            if username in users and _check_passcode(username, passcode, users[username]["passcode"]):
                 return {
                     "username": username,
                     "display_name": users[username]["display_name"],
@@ -51,7 +88,7 @@ class AuthManager:
                         if username == "admin":
                             with st.expander("🔧 Debug Info (Admin Only)"):
                                 try:
-                                    users = self.config.get_users()
+                                    users = _cached_users(self.config)
                                     st.write(f"System has {len(users)} users")
                                     st.write("Available usernames:", list(users.keys()))
                                     if "admin" in users:
@@ -64,19 +101,22 @@ class AuthManager:
                 else:
                     st.warning("Please enter both username and passcode")
     
+    def clear_users_cache(self):
+        """Forget cached users so new or changed logins take effect"""
+        _cached_users.clear()
+        _verified_logins.clear()
+    
     def logout(self):
         """Logout current user"""
         if "user" in st.session_state:
             del st.session_state.user
-        if "logged_in" in st.session_state:
-            del st.session_state.logged_in
+        st.session_state.logged_in = False
         st.rerun()
     
     def require_login(self):
         """Check if user is logged in, redirect to login if not"""
-        if "logged_in" not in st.session_state or not st.session_state.logged_in:
-            return False
-        return True
+        st.session_state.setdefault("logged_in", False)
+        return st.session_state.logged_in
     
     def is_admin(self):
         """Check if current user is admin"""
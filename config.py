@@ -1,17 +1,59 @@
-import json
 import os
 import base64
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import hashlib
 import hmac
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from crypto_utils import json_dumps, json_loads
 
 # Points configuration
 POINTS_EXACT_SCORE = 2
 POINTS_CORRECT_RESULT = 1
 POINTS_GOAL_DIFFERENCE = 0
 
+# Seconds to wait on a GitHub API call before giving up
+GITHUB_TIMEOUT = 15
+
+# Contents written when the data repo has no users.json / settings.json yet.
+# Timestamps (None here) are filled in when the files are created.
+DEFAULT_ADMIN_USER = {
+    "passcode": "admin_hash_here",  # You should hash this properly
+    "display_name": "Administrator",
+    "is_admin": True,
+    "created_at": None
+}
+DEFAULT_SETTINGS = {
+    "current_week": 1,
+    "season_start": None,
+    "league_name": "Prediction League",
+    "points_system": {
+        "exact_score": POINTS_EXACT_SCORE,
+        "correct_result": POINTS_CORRECT_RESULT,
+        "goal_difference": POINTS_GOAL_DIFFERENCE
+    },
+    "front_page_blurb": "",
+    "predictions_open": True,
+    "settings_updated_at": None
+}
+
+def github_session(headers):
+    """Pooled keep-alive session for GitHub API calls
+    
+    GETs are retried with backoff on rate limiting and transient server errors
+    (honouring Retry-After). Writes aren't, since a PUT that actually landed
+    would then fail on its stale sha.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=frozenset(["GET"]), raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
+
 PBKDF2_ALGO = "pbkdf2_sha256"
 PBKDF2_ITERATIONS = 390000
 
@@ -42,9 +84,15 @@ def verify_passcode(passcode, stored_value):
         except Exception:
             return False
 
-    return stored_value == passcode
+    # Legacy plaintext entry - still compare in constant time
+    return hmac.compare_digest(stored_value.encode("utf-8"), (passcode or "").encode("utf-8"))
 
 class GitHubConfigManager:
+    # Fetched config files shared by every instance: (base_url, path) -> (etag, content, sha, parsed)
+    _cache = {}
+    # Repos (by base_url) whose config files are known to exist in this process
+    _initialized = set()
+    
     def __init__(self):
         # GitHub configuration
         self.github_token = os.getenv('GITHUB_TOKEN')
@@ -60,33 +108,57 @@ class GitHubConfigManager:
             'Authorization': f'token {self.github_token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        # Pooled keep-alive connection so each call doesn't pay a new TLS handshake
+        self.session = github_session(self.headers)
         
         # Configuration file paths
         self.users_file = "users.json"
         self.settings_file = "settings.json"
+        # (parsed users dict, admin usernames) for the last users.json seen
+        self._admins = None
         
         # Initialize with default data if files don't exist
         self._initialize_config_files()
     
     def _get_file_from_github(self, file_path):
-        """Get file content from GitHub"""
+        """Get file content from GitHub
+        
+        The last response per file is kept and revalidated with If-None-Match,
+        so an unchanged file costs a 304 and no decode.
+        """
+        key = (self.base_url, file_path)
         url = f"{self.base_url}/{file_path}"
-        response = requests.get(url, headers=self.headers)
+        headers = self.headers
+        cached = self._cache.get(key)
+        if cached:
+            headers = {**self.headers, 'If-None-Match': cached[0]}
+        
+        response = self.session.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
         
-        if response.status_code == 200:
+        if response.status_code == 304:
+            return cached[1], cached[2]
+        elif response.status_code == 200:
             file_data = response.json()
             content = base64.b64decode(file_data['content']).decode('utf-8')
+            etag = response.headers.get('ETag')
+            if etag:
+                self._cache[key] = (etag, content, file_data['sha'], None)
+            else:
+                self._cache.pop(key, None)
             return content, file_data['sha']
         elif response.status_code == 404:
+            self._cache.pop(key, None)
             return None, None
         else:
             response.raise_for_status()
     
     def _save_file_to_github(self, file_path, content, message, sha=None):
-        """Save file content to GitHub"""
+        """Save file content (str or UTF-8 bytes) to GitHub"""
         url = f"{self.base_url}/{file_path}"
         
-        encoded_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        encoded_content = base64.b64encode(content).decode('ascii')
         
         data = {
             'message': message,
@@ -97,62 +169,126 @@ class GitHubConfigManager:
         if sha:
             data['sha'] = sha
         
-        response = requests.put(url, headers=self.headers, json=data)
+        response = self.session.put(url, json=data, timeout=GITHUB_TIMEOUT)
+        self._invalidate(file_path)
         
         if response.status_code in [200, 201]:
             return response.json()
         else:
             response.raise_for_status()
     
+    def _invalidate(self, file_path):
+        """Drop the cached copy of a file so the next read refetches it"""
+        self._cache.pop((self.base_url, file_path), None)
+    
+    def _get_json_with_sha(self, file_path):
+        """Get (parsed JSON content, blob sha) from GitHub, re-parsing only when the file changes
+        
+        The parsed content is None if the file doesn't exist. It's shared, so
+        callers must not mutate it.
+        """
+        content, sha = self._get_file_from_github(file_path)
+        if not content:
+            return None, sha
+        
+        key = (self.base_url, file_path)
+        cached = self._cache.get(key)
+        if cached and cached[1] is content:
+            if cached[3] is None:
+                self._cache[key] = cached[:3] + (json_loads(content),)
+            return self._cache[key][3], sha
+        return json_loads(content), sha
+    
+    def _get_json_from_github(self, file_path):
+        """Get parsed JSON content from GitHub (shared, so don't mutate it)"""
+        return self._get_json_with_sha(file_path)[0]
+    
+    def _get_files_from_github(self, file_paths):
+        """Get several files from GitHub concurrently, as a list of (content, sha)"""
+        with ThreadPoolExecutor(max_workers=len(file_paths)) as executor:
+            return list(executor.map(self._get_file_from_github, file_paths))
+    
+    def _update_json_file(self, file_path, update, message):
+        """Read-modify-write a JSON file, skipping the read when the cache is warm
+        
+        update(data) changes the parsed data in place. If GitHub rejects the
+        cached sha as stale, the file is re-read and the update retried once.
+        """
+        for attempt in range(2):
+            cached = self._cache.get((self.base_url, file_path)) if attempt == 0 else None
+            if cached:
+                content, sha = cached[1], cached[2]
+            else:
+                content, sha = self._get_file_from_github(file_path)
+            
+            data = json_loads(content) if content else {}
+            update(data)
+            
+            try:
+                return self._save_file_to_github(file_path, json_dumps(data, indent=True), message, sha)
+            except requests.exceptions.HTTPError as e:
+                # 409: sha no longer matches, 422: file exists but no sha was sent
+                stale = e.response is not None and e.response.status_code in (409, 422)
+                if attempt == 0 and cached and stale:
+                    continue
+                raise
+    
+    def _update_settings(self, message, **changes):
+        """Apply changes to settings.json and stamp settings_updated_at"""
+        def update(settings):
+            settings.update(changes)
+            settings["settings_updated_at"] = datetime.now().isoformat()
+        
+        self._update_json_file(self.settings_file, update, message)
+    
     def _initialize_config_files(self):
-        """Initialize config files with default data if they don't exist"""
+        """Initialize config files with default data if they don't exist
+        
+        Runs once per repo per process; every manager constructed after that skips
+        the existence checks.
+        """
+        if self.base_url in self._initialized:
+            return
+        
+        # Both files are independent, so check them in parallel
+        (users_content, _), (settings_content, _) = self._get_files_from_github(
+            [self.users_file, self.settings_file]
+        )
+        
+        now = datetime.now().isoformat()
         
         # Check and create users.json
-        users_content, _ = self._get_file_from_github(self.users_file)
         if not users_content:
-            default_users = {
-                "admin": {
-                    "passcode": "admin_hash_here",  # You should hash this properly
-                    "display_name": "Administrator",
-                    "is_admin": True,
-                    "created_at": datetime.now().isoformat()
-                }
-            }
+            default_users = {"admin": {**DEFAULT_ADMIN_USER, "created_at": now}}
             self._save_file_to_github(
                 self.users_file, 
-                json.dumps(default_users, indent=2), 
+                json_dumps(default_users, indent=True), 
                 "Initialize users configuration"
             )
         
         # Check and create settings.json
-        settings_content, _ = self._get_file_from_github(self.settings_file)
         if not settings_content:
-            default_settings = {
-                "current_week": 1,
-                "season_start": datetime.now().isoformat(),
-                "league_name": "Prediction League",
-                "points_system": {
-                    "exact_score": POINTS_EXACT_SCORE,
-                    "correct_result": POINTS_CORRECT_RESULT,
-                    "goal_difference": POINTS_GOAL_DIFFERENCE
-                },
-                "front_page_blurb": "",
-                "predictions_open": True,
-                "settings_updated_at": datetime.now().isoformat()
-            }
+            default_settings = {**DEFAULT_SETTINGS, "season_start": now, "settings_updated_at": now}
             self._save_file_to_github(
                 self.settings_file,
-                json.dumps(default_settings, indent=2),
+                json_dumps(default_settings, indent=True),
                 "Initialize league settings"
             )
+        
+        self._initialized.add(self.base_url)
+    
+    def get_users_with_sha(self):
+        """Get all users and the users.json blob sha they were read from
+        
+        Unlike get_users, raises if users.json can't be read.
+        """
+        users, sha = self._get_json_with_sha(self.users_file)
+        return users or {}, sha
     
     def get_users(self):
         """Get all users from GitHub"""
         try:
-            content, _ = self._get_file_from_github(self.users_file)
-            if content:
-                return json.loads(content)
-            return {}
+            return self.get_users_with_sha()[0]
         except Exception as e:
             print(f"Error loading users: {e}")
             return {}
@@ -160,22 +296,17 @@ class GitHubConfigManager:
     def add_user(self, username, passcode, display_name, is_admin=False):
         """Add a new user"""
         try:
-            users_content, sha = self._get_file_from_github(self.users_file)
-            users = json.loads(users_content) if users_content else {}
-            
-            users[username] = {
+            new_user = {
                 "passcode": hash_passcode(passcode),
                 "display_name": display_name,
                 "is_admin": is_admin,
                 "created_at": datetime.now().isoformat()
             }
             
-            self._save_file_to_github(
-                self.users_file,
-                json.dumps(users, indent=2),
-                f"Add new user: {username}",
-                sha
-            )
+            def update(users):
+                users[username] = new_user
+            
+            self._update_json_file(self.users_file, update, f"Add new user: {username}")
             return True
         except Exception as e:
             print(f"Error adding user {username}: {e}")
@@ -202,9 +333,8 @@ class GitHubConfigManager:
     def get_current_week(self):
         """Get current week number"""
         try:
-            content, _ = self._get_file_from_github(self.settings_file)
-            if content:
-                settings = json.loads(content)
+            settings = self._get_json_from_github(self.settings_file)
+            if settings:
                 return settings.get("current_week", 1)
             return 1
         except Exception as e:
@@ -214,18 +344,7 @@ class GitHubConfigManager:
     def set_current_week(self, week_num):
         """Set current week number"""
         try:
-            content, sha = self._get_file_from_github(self.settings_file)
-            settings = json.loads(content) if content else {}
-            
-            settings["current_week"] = week_num
-            settings["settings_updated_at"] = datetime.now().isoformat()
-            
-            self._save_file_to_github(
-                self.settings_file,
-                json.dumps(settings, indent=2),
-                f"Update current week to {week_num}",
-                sha
-            )
+            self._update_settings(f"Update current week to {week_num}", current_week=week_num)
             return True
         except Exception as e:
             print(f"Error setting current week: {e}")
@@ -234,10 +353,7 @@ class GitHubConfigManager:
     def get_league_settings(self):
         """Get league settings"""
         try:
-            content, _ = self._get_file_from_github(self.settings_file)
-            if content:
-                return json.loads(content)
-            return {}
+            return self._get_json_from_github(self.settings_file) or {}
         except Exception as e:
             print(f"Error getting league settings: {e}")
             return {}
@@ -245,31 +361,22 @@ class GitHubConfigManager:
     def update_league_settings(self, **kwargs):
         """Update league settings"""
         try:
-            content, sha = self._get_file_from_github(self.settings_file)
-            settings = json.loads(content) if content else {}
-            
-            # Update provided settings
-            for key, value in kwargs.items():
-                settings[key] = value
-            
-            settings["settings_updated_at"] = datetime.now().isoformat()
-            
-            self._save_file_to_github(
-                self.settings_file,
-                json.dumps(settings, indent=2),
-                "Update league settings",
-                sha
-            )
+            self._update_settings("Update league settings", **kwargs)
             return True
         except Exception as e:
             print(f"Error updating league settings: {e}")
             return False
     
+    def _get_admins(self):
+        """Admin usernames, recomputed only when users.json changes"""
+        users = self.get_users()
+        if self._admins is None or self._admins[0] is not users:
+            self._admins = (users, frozenset(u for u, info in users.items() if info.get("is_admin")))
+        return self._admins[1]
+    
     def is_admin(self, username):
         """Check if user is admin"""
-        users = self.get_users()
-        user_info = users.get(username, {})
-        return user_info.get("is_admin", False)
+        return username in self._get_admins()
     
     def get_front_page_blurb(self):
         """Get the front page blurb text"""
@@ -278,17 +385,7 @@ class GitHubConfigManager:
 
     def set_front_page_blurb(self, blurb):
         """Set the front page blurb text"""
-        content, sha = self._get_file_from_github(self.settings_file)
-        settings = json.loads(content) if content else {}
-        settings["front_page_blurb"] = blurb
-        settings["settings_updated_at"] = datetime.now().isoformat()
-        
-        self._save_file_to_github(
-            self.settings_file,
-            json.dumps(settings, indent=2),
-            "Update front page blurb",
-            sha
-        )
+        self._update_settings("Update front page blurb", front_page_blurb=blurb)
         return True
     
     def are_predictions_open(self):
@@ -298,22 +395,15 @@ class GitHubConfigManager:
     
     def set_predictions_open(self, open_status):
         """Set whether predictions are being accepted"""
-        content, sha = self._get_file_from_github(self.settings_file)
-        settings = json.loads(content) if content else {}
-        settings["predictions_open"] = open_status
-        settings["settings_updated_at"] = datetime.now().isoformat()
-        
-        self._save_file_to_github(
-            self.settings_file,
-            json.dumps(settings, indent=2),
-            f"Set predictions open to {open_status}",
-            sha
-        )
+        self._update_settings(f"Set predictions open to {open_status}", predictions_open=open_status)
         return True
 
 class ConfigManager(GitHubConfigManager):
     def initialize_users(self):
         # Just re-run the file initializer (users.json and settings.json)
+        for file_path in (self.users_file, self.settings_file):
+            self._invalidate(file_path)
+        self._initialized.discard(self.base_url)
         self._initialize_config_files()
         return self.get_users()
 
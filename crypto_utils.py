@@ -1,47 +1,83 @@
 import json
 import base64
 import os
+from functools import lru_cache
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+try:
+    import orjson  # Faster JSON parsing when available
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson if it's installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+def json_dumps(data, indent=False, default=str):
+    """Serialize to JSON bytes, using orjson if it's installed
+    
+    Output is compact unless indent is set, in which case it's indented by two
+    spaces like json.dumps(indent=2). Values JSON can't represent (datetimes,
+    numpy scalars, ...) are passed to default, str() unless given.
+    """
+    if orjson is not None:
+        # OPT_NON_STR_KEYS turns int keys etc. into strings like json.dumps does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=default, option=option)
+    return json.dumps(data, default=default, indent=2 if indent else None).encode('utf-8')
+
+# Every Fernet token starts with version byte 0x80, i.e. "gAAAAA" once base64 encoded
+FERNET_TOKEN_PREFIX = b"gAAAAA"
+
+@lru_cache(maxsize=8)
+def _derive_key(password):
+    """Derive a Fernet key from a password (PBKDF2 runs once per password per process)"""
+    salt = b'prediction-league-salt'  # In production, use a random salt
+    
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password))
+
+@lru_cache(maxsize=8)
+def _get_fernet(key):
+    """Shared Fernet instance per key"""
+    return Fernet(key)
+
 class DataEncryption:
-    def __init__(self):
-        # Get encryption key from environment variable or generate one
-        self.encryption_key = self._get_or_create_key()
-        self.fernet = Fernet(self.encryption_key)
+    def __init__(self, key=None, password=None):
+        # Use the given key/password, else fall back to environment variables
+        self.encryption_key = self._get_or_create_key(key, password)
+        self.fernet = _get_fernet(self.encryption_key)
     
-    def _get_or_create_key(self):
-        """Get encryption key from environment or generate a new one"""
-        # Check if key exists in environment variable
-        env_key = os.getenv('ENCRYPTION_KEY')
+    def _get_or_create_key(self, key=None, password=None):
+        """Get encryption key from arguments or environment, or derive one from a password"""
+        # Check if a key was given or exists in environment variable
+        env_key = key or os.getenv('ENCRYPTION_KEY')
         if env_key:
             return env_key.encode()
         
         # Generate key from password (you should set this as an environment variable)
-        password = os.getenv('ENCRYPTION_PASSWORD', 'default-password-change-me').encode()
-        salt = b'prediction-league-salt'  # In production, use a random salt
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
+        password = password or os.getenv('ENCRYPTION_PASSWORD', 'default-password-change-me')
+        return _derive_key(password.encode())
     
     def encrypt_data(self, data):
         """Encrypt data (dict or list) and return as string"""
         try:
-            # Convert to JSON string
-            json_data = json.dumps(data, default=str)
+            # Convert to JSON bytes
+            json_data = json_dumps(data)
             
-            # Encrypt the JSON string
-            encrypted_data = self.fernet.encrypt(json_data.encode())
-            
-            # Return as base64 string for storage
-            return base64.urlsafe_b64encode(encrypted_data).decode()
+            # Encrypt the JSON - a Fernet token is already urlsafe base64
+            return self.fernet.encrypt(json_data).decode()
         
         except Exception as e:
             print(f"Encryption error: {e}")
@@ -50,15 +86,17 @@ class DataEncryption:
     def decrypt_data(self, encrypted_string):
         """Decrypt string and return as original data structure"""
         try:
-            # Decode from base64
-            encrypted_data = base64.urlsafe_b64decode(encrypted_string.encode())
+            encrypted_data = encrypted_string.strip().encode()
+            
+            # Older files wrapped the token in a second layer of base64
+            if not encrypted_data.startswith(FERNET_TOKEN_PREFIX):
+                encrypted_data = base64.urlsafe_b64decode(encrypted_data)
             
-            # Decrypt to get JSON string
+            # Decrypt to get JSON bytes
             decrypted_bytes = self.fernet.decrypt(encrypted_data)
-            json_string = decrypted_bytes.decode()
             
             # Parse JSON back to Python object
-            return json.loads(json_string)
+            return json_loads(decrypted_bytes)
         
         except Exception as e:
             print(f"Decryption error: {e}")
@@ -74,7 +112,7 @@ class DataEncryption:
         if isinstance(filename, str) and filename.startswith('{'):
             # If it looks like JSON, try to parse directly
             try:
-                return json.loads(filename)
+                return json_loads(filename)
             except:
                 pass
         return self.decrypt_data(filename) if filename else None
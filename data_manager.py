@@ -1,23 +1,55 @@
-import pandas as pd
 import os
-import sys
-import json
+import re
 import base64
+import hashlib
+import time
 import requests
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import streamlit as st
+from crypto_utils import DataEncryption, json_dumps, json_loads
+from config import ConfigManager, GITHUB_TIMEOUT, github_session, POINTS_CORRECT_RESULT, POINTS_EXACT_SCORE, POINTS_GOAL_DIFFERENCE
 
-# Add current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+def _read_csv(content, **kwargs):
+    """Parse CSV text from GitHub into a DataFrame
+    
+    Uses pyarrow's multithreaded parser (pyarrow ships with Streamlit) but keeps
+    numpy dtypes, so missing scores stay NaN rather than pd.NA.
+    """
+    from io import BytesIO
+    import pandas as pd
+    return pd.read_csv(BytesIO(content.encode('utf-8')), engine="pyarrow", **kwargs)
 
-from crypto_utils import DataEncryption
-from config import ConfigManager, POINTS_CORRECT_RESULT, POINTS_EXACT_SCORE, POINTS_GOAL_DIFFERENCE
+def _read_results_csv(content):
+    """Parse a results CSV, which may be comma or tab separated"""
+    # Pick the separator from the header line rather than parsing twice
+    header = content.split('\n', 1)[0]
+    sep = '\t' if header.count('\t') > header.count(',') else ','
+    df = _read_csv(content, sep=sep)
+    
+    # Clean up column names (remove extra whitespace)
+    df.columns = df.columns.str.strip()
+    return df
+
+@lru_cache(maxsize=None)
+def _get_secret(key):
+    """Get secret from Streamlit secrets or environment variables (read once per process)"""
+    try:
+        # Try Streamlit secrets first (raises if there's no secrets file at all)
+        if key in st.secrets:
+            return st.secrets[key]
+    except Exception:
+        pass
+    
+    # Fallback to environment variables
+    return os.getenv(key)
 
 class GitHubDataManager:
-    def __init__(self):
+    def __init__(self, config=None):
         # Initialize encryption with Streamlit secrets
         self.encryption = self._initialize_encryption()
-        self.config = ConfigManager()
+        self.config = config or ConfigManager()
         
         # GitHub configuration - get from Streamlit secrets or environment variables
         self.github_token = self._get_secret('GITHUB_TOKEN')
@@ -33,74 +65,163 @@ class GitHubDataManager:
             'Authorization': f'token {self.github_token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        # Pooled keep-alive connection so each call doesn't pay a new TLS handshake
+        self.session = github_session(self.headers)
+        
+        # Fetched files keyed by path: (etag, content, sha, fetched_at)
+        self._file_cache = {}
+        # Repository file listing: (path -> sha, fetched_at)
+        self._tree_cache = None
+        # Parsed form of fetched files keyed by path: (content it was parsed from, parsed)
+        self._parsed_cache = {}
+        
+        # Derived leaderboard stored alongside the data it's computed from
+        self.leaderboard_cache_file = "leaderboard.cache.json"
+        # Last leaderboard computed in this process: (current_week, inputs, leaderboard)
+        self._leaderboard_memo = None
+    
+    def close(self):
+        """Close the pooled GitHub connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def _get_secret(self, key):
         """Get secret from Streamlit secrets or environment variables"""
-        try:
-            # Try Streamlit secrets first
-            if hasattr(st, 'secrets') and key in st.secrets:
-                return st.secrets[key]
-        except:
-            pass
-        
-        # Fallback to environment variables
-        return os.getenv(key)
+        return _get_secret(key)
     
     def _initialize_encryption(self):
         """Initialize encryption with proper key from Streamlit secrets"""
-        # Temporarily set environment variables for the DataEncryption class
-        encryption_key = self._get_secret('ENCRYPTION_KEY')
-        encryption_password = self._get_secret('ENCRYPTION_PASSWORD')
-        
-        # Store original env vars to restore later
-        original_key = os.environ.get('ENCRYPTION_KEY')
-        original_password = os.environ.get('ENCRYPTION_PASSWORD')
-        
+        # Pass the secrets straight in rather than round-tripping through os.environ,
+        # which is process-wide and shared by every session thread
+        return DataEncryption(
+            key=self._get_secret('ENCRYPTION_KEY'),
+            password=self._get_secret('ENCRYPTION_PASSWORD')
+        )
+    
+    def _cache_ttl(self, file_path):
+        """Seconds a fetched file is reused before revalidating with GitHub"""
+        # Fixtures rarely change once uploaded; predictions and results do
+        return 600 if file_path.startswith("fixtures/") else 60
+    
+    def clear_cache(self, file_path=None):
+        """Drop cached GitHub files (all of them if no path is given)"""
+        if file_path is None:
+            self._file_cache.clear()
+            self._parsed_cache.clear()
+        else:
+            self._file_cache.pop(file_path, None)
+            self._parsed_cache.pop(file_path, None)
+        self._tree_cache = None
+    
+    def _get_parsed(self, file_path, content, parse):
+        """parse(content), reused for as long as the file's content is unchanged
+        
+        Unchanged files come back from _get_file_from_github as the same str
+        object, so an identity check is enough. The parsed object is shared,
+        so callers must not mutate it.
+        """
+        cached = self._parsed_cache.get(file_path)
+        if cached and cached[0] is content:
+            return cached[1]
+        parsed = parse(content)
+        if parsed is not None:
+            self._parsed_cache[file_path] = (content, parsed)
+        return parsed
+    
+    def _fresh_tree(self):
+        """The cached repo listing if it's recent enough to trust, else None"""
+        if self._tree_cache and time.time() - self._tree_cache[1] < 30:
+            return self._tree_cache[0]
+        return None
+    
+    def _list_repo_files(self):
+        """List every file in the data repo (path -> blob SHA) with one Git Trees API call"""
+        files = self._fresh_tree()
+        if files is not None:
+            return files
+        
+        url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/git/trees/{self.branch}?recursive=1"
+        response = self.session.get(url, timeout=GITHUB_TIMEOUT)
+        response.raise_for_status()
+        
+        # Path -> blob SHA; iterating gives the paths
+        files = {item['path']: item['sha'] for item in response.json().get('tree', []) if item.get('type') == 'blob'}
+        self._tree_cache = (files, time.time())
+        return files
+    
+    def list_existing(self, folder):
+        """Get the set of week numbers that have a file in folder (e.g. "results")"""
+        pattern = re.compile(rf"^{re.escape(folder.strip('/'))}/week(\d+)\.\w+$")
+        weeks = set()
         try:
-            # Set the secrets as environment variables temporarily
-            if encryption_key:
-                os.environ['ENCRYPTION_KEY'] = encryption_key
-            if encryption_password:
-                os.environ['ENCRYPTION_PASSWORD'] = encryption_password
-            
-            # Create the encryption instance
-            encryption = DataEncryption()
-            
-        finally:
-            # Restore original environment variables
-            if original_key is not None:
-                os.environ['ENCRYPTION_KEY'] = original_key
-            elif 'ENCRYPTION_KEY' in os.environ:
-                del os.environ['ENCRYPTION_KEY']
-            
-            if original_password is not None:
-                os.environ['ENCRYPTION_PASSWORD'] = original_password
-            elif 'ENCRYPTION_PASSWORD' in os.environ:
-                del os.environ['ENCRYPTION_PASSWORD']
-        
-        return encryption
+            for path in self._list_repo_files():
+                match = pattern.match(path)
+                if match:
+                    weeks.add(int(match.group(1)))
+        except Exception as e:
+            st.error(f"Error listing {folder} files: {e}")
+        return weeks
     
-    def _get_file_from_github(self, file_path):
-        """Get file content from GitHub"""
-        url = f"{self.base_url}/{file_path}"
-        response = requests.get(url, headers=self.headers)
+    def results_weeks(self):
+        """Get the set of week numbers that have results uploaded"""
+        return self.list_existing("results")
+    
+    def _get_file_from_github(self, file_path, max_age=None):
+        """Get file content from GitHub
+        
+        Files are reused for max_age seconds (a per-path default if None),
+        then revalidated with If-None-Match so unchanged files cost a 304.
+        Pass max_age=0 before a write to always revalidate.
+        """
+        if max_age is None:
+            max_age = self._cache_ttl(file_path)
+        
+        cached = self._file_cache.get(file_path)
+        
+        # A recent tree listing settles whether the cached copy is current: the same
+        # blob SHA (or still no such file) skips even the conditional request, and a
+        # different one refetches even inside the TTL, so reads agree with the listing
+        tree = self._fresh_tree() if cached and max_age else None
+        if tree is not None:
+            if tree.get(file_path) == cached[2]:
+                self._file_cache[file_path] = cached[:3] + (time.time(),)
+                return cached[1], cached[2]
+        elif cached and time.time() - cached[3] < max_age:
+            return cached[1], cached[2]
         
-        if response.status_code == 200:
+        url = f"{self.base_url}/{file_path}"
+        headers = self.headers
+        if cached and cached[0]:
+            headers = {**self.headers, 'If-None-Match': cached[0]}
+        response = self.session.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+        
+        if response.status_code == 304:
+            self._file_cache[file_path] = cached[:3] + (time.time(),)
+            return cached[1], cached[2]
+        elif response.status_code == 200:
             file_data = response.json()
             # Decode base64 content
             content = base64.b64decode(file_data['content']).decode('utf-8')
+            self._file_cache[file_path] = (response.headers.get('ETag'), content, file_data['sha'], time.time())
             return content, file_data['sha']
         elif response.status_code == 404:
+            self._file_cache[file_path] = (None, None, None, time.time())
             return None, None
         else:
             response.raise_for_status()
     
     def _save_file_to_github(self, file_path, content, message, sha=None):
-        """Save file content to GitHub"""
+        """Save file content (str or UTF-8 bytes) to GitHub"""
         url = f"{self.base_url}/{file_path}"
         
         # Encode content as base64
-        encoded_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
+        raw = content.encode('utf-8') if isinstance(content, str) else content
+        encoded_content = base64.b64encode(raw).decode('ascii')
         
         data = {
             'message': message,
@@ -112,14 +233,76 @@ class GitHubDataManager:
         if sha:
             data['sha'] = sha
         
-        response = requests.put(url, headers=self.headers, json=data)
+        response = self.session.put(url, json=data, timeout=GITHUB_TIMEOUT)
+        self.clear_cache(file_path)
         
         if response.status_code in [200, 201]:
-            return response.json()
+            result = response.json()
+            # Remember what was just written, so the next save of this file knows its sha
+            new_sha = (result.get('content') or {}).get('sha')
+            if new_sha:
+                self._file_cache[file_path] = (None, raw.decode('utf-8'), new_sha, time.time())
+            return result
         else:
             # Raise an exception with the actual error details
             error_msg = f"GitHub API Error {response.status_code}: {response.text}"
-            raise requests.exceptions.RequestException(error_msg)
+            raise requests.exceptions.RequestException(error_msg, response=response)
+    
+    def _prefetch(self, file_path):
+        """Pull a file into the cache, leaving any error for the real read to report"""
+        try:
+            self._get_file_from_github(file_path)
+        except Exception:
+            pass
+    
+    def _known_sha(self, file_path):
+        """Last known blob sha of a file without a network call (None if unknown or absent)"""
+        cached = self._file_cache.get(file_path)
+        if cached:
+            return cached[2]
+        if self._tree_cache:
+            return self._tree_cache[0].get(file_path)
+        return None
+    
+    def _replace_file(self, file_path, content, add_message, update_message):
+        """Overwrite a whole file on GitHub without probing for its sha first
+        
+        Uses the last known sha; if GitHub rejects it as stale (409/422), the
+        current sha is fetched and the write retried once. Returns the PUT response.
+        """
+        sha = self._known_sha(file_path)
+        for attempt in range(2):
+            message = update_message if sha else add_message
+            try:
+                return self._save_file_to_github(file_path, content, message, sha)
+            except requests.exceptions.RequestException as e:
+                stale = e.response is not None and e.response.status_code in (409, 422)
+                if attempt == 0 and stale:
+                    _, sha = self._get_file_from_github(file_path, max_age=0)
+                    continue
+                raise
+    
+    def _read_modify_write(self, file_path, build, message):
+        """Rewrite a file from its current content, skipping the read when it's cached
+        
+        build(content) returns the new content (content is None if the file
+        doesn't exist yet). If GitHub rejects the sha as stale (409/422), the
+        file is re-read and build run again, once. Returns the PUT response.
+        """
+        for attempt in range(2):
+            cached = self._file_cache.get(file_path) if attempt == 0 else None
+            if cached:
+                content, sha = cached[1], cached[2]
+            else:
+                content, sha = self._get_file_from_github(file_path, max_age=0)
+            
+            try:
+                return self._save_file_to_github(file_path, build(content), message, sha)
+            except requests.exceptions.RequestException as e:
+                stale = e.response is not None and e.response.status_code in (409, 422)
+                if attempt == 0 and stale:
+                    continue
+                raise
     
     def load_fixtures(self, week_num):
         """Load fixtures for a specific week from GitHub"""
@@ -128,112 +311,122 @@ class GitHubDataManager:
             content, _ = self._get_file_from_github(file_path)
             if content:
                 # Convert CSV string to DataFrame
-                from io import StringIO
-                return pd.read_csv(StringIO(content))
+                return self._get_parsed(file_path, content, _read_csv)
             return None
         except Exception as e:
             st.error(f"Error loading fixtures for week {week_num}: {e}")
             return None
     
+    def _fetch_results(self, week_num):
+        """Results for a week as (DataFrame, blob sha)
+        
+        The DataFrame is None if the week has no results file. Raises if the
+        file can't be fetched or is missing columns, rather than passing that
+        off as "no results".
+        """
+        file_path = f"results/week{week_num}.csv"
+        content, sha = self._get_file_from_github(file_path)
+        if not content:
+            return None, sha
+        df = self._get_parsed(file_path, content, _read_results_csv)
+        
+        # Ensure we have the expected columns
+        expected_cols = ['home_team', 'away_team', 'home_score', 'away_score']
+        if not all(col in df.columns for col in expected_cols):
+            raise ValueError(f"Results file missing required columns. Found: {list(df.columns)}, Expected: {expected_cols}")
+        return df, sha
+    
     def load_results(self, week_num):
         """Load results for a specific week from GitHub"""
-        file_path = f"results/week{week_num}.csv"
         try:
-            content, _ = self._get_file_from_github(file_path)
-            if content:
-                from io import StringIO
-                # Handle both comma and tab-separated files
-                # First try comma separator
-                try:
-                    df = pd.read_csv(StringIO(content))
-                except:
-                    # If that fails, try tab separator
-                    df = pd.read_csv(StringIO(content), sep='\t')
-                
-                # Clean up column names (remove extra whitespace)
-                df.columns = df.columns.str.strip()
-                
-                # Ensure we have the expected columns
-                expected_cols = ['home_team', 'away_team', 'home_score', 'away_score']
-                if not all(col in df.columns for col in expected_cols):
-                    st.error(f"Week {week_num} results file missing required columns. Found: {list(df.columns)}, Expected: {expected_cols}")
-                    return None
-                
-                return df
-            return None
+            return self._fetch_results(week_num)[0]
         except Exception as e:
             st.error(f"Error loading results for week {week_num}: {e}")
             return None
     
     def save_predictions(self, username, week_num, predictions):
         """Save user predictions for a week to GitHub (encrypted)"""
+        try:
+            self.save_predictions_bulk(
+                week_num,
+                {username: predictions},
+                f"Update predictions for {username} - Week {week_num}"
+            )
+            return True
+        except Exception as e:
+            st.error(f"Error saving predictions for {username}, week {week_num}: {e}")
+            return False
+    
+    def save_predictions_bulk(self, week_num, predictions_by_user, commit_message=None):
+        """Save several users' predictions for a week in one commit (encrypted)
+        
+        The week file is shared by every user, so it goes through
+        _read_modify_write, which retries once if someone else saved in between.
+        Raises on failure, including when the existing file can't be decrypted,
+        since writing over it would drop every other user's predictions.
+        """
         file_path = f"predictions/week{week_num}.json"
+        if commit_message is None:
+            commit_message = f"Update predictions for {len(predictions_by_user)} users - Week {week_num}"
         
-        try:
-            # Load existing predictions for this week
-            content, sha = self._get_file_from_github(file_path)
+        def build(content):
             if content:
                 # Decrypt existing data
-                try:
-                    all_predictions = self.encryption.decrypt_data(content)
-                    if all_predictions is None:
-                        st.warning("Failed to decrypt existing predictions. Creating new file.")
-                        all_predictions = {}
-                except Exception as e:
-                    st.warning(f"Error decrypting existing predictions: {e}. Creating new file.")
-                    all_predictions = {}
+                all_predictions = self.encryption.decrypt_data(content)
+                if all_predictions is None:
+                    raise ValueError("existing predictions could not be decrypted")
             else:
                 all_predictions = {}
             
-            # Update predictions for this user
-            all_predictions[username] = {
-                "predictions": predictions,
-                "submitted_at": datetime.now().isoformat()
-            }
+            # Update predictions for these users
+            submitted_at = datetime.now().isoformat()
+            for username, predictions in predictions_by_user.items():
+                all_predictions[username] = {
+                    "predictions": predictions,
+                    "submitted_at": submitted_at
+                }
             
-            # Encrypt and save back to GitHub
+            # Encrypt for saving back to GitHub
             encrypted_content = self.encryption.encrypt_data(all_predictions)
             if encrypted_content is None:
-                st.error("Failed to encrypt predictions data")
-                return False
-            
-            commit_message = f"Update predictions for {username} - Week {week_num}"
-            self._save_file_to_github(file_path, encrypted_content, commit_message, sha)
-            
-            return True
-            
-        except Exception as e:
-            st.error(f"Error saving predictions for {username}, week {week_num}: {e}")
-            return False
+                raise ValueError("Failed to encrypt predictions data")
+            return encrypted_content
+        
+        self._read_modify_write(file_path, build, commit_message)
+    
+    def _fetch_predictions(self, week_num):
+        """Every user's predictions for a week as (dict, blob sha)
+        
+        The dict is empty if the week has no predictions file. Raises if the
+        file can't be fetched or decrypted. The dict is shared, so callers
+        must not mutate it.
+        """
+        file_path = f"predictions/week{week_num}.json"
+        content, sha = self._get_file_from_github(file_path)
+        if not content:
+            return {}, sha
+        all_predictions = self._get_parsed(file_path, content, self.encryption.decrypt_data)
+        if all_predictions is None:
+            raise ValueError("Failed to decrypt predictions. Check encryption keys.")
+        return all_predictions, sha
     
     def load_predictions(self, week_num, username=None):
         """Load predictions for a week from GitHub (decrypt automatically)"""
-        file_path = f"predictions/week{week_num}.json"
         try:
-            content, _ = self._get_file_from_github(file_path)
-            if content:
-                try:
-                    all_predictions = self.encryption.decrypt_data(content)
-                    if all_predictions is None:
-                        st.error(f"Failed to decrypt predictions for week {week_num}. Check encryption keys.")
-                        return {} if not username else []
-                except Exception as e:
-                    st.error(f"Error decrypting predictions for week {week_num}: {e}")
-                    return {} if not username else []
-            else:
-                all_predictions = {}
-            
-            if username:
-                user_data = all_predictions.get(username, {})
-                return user_data.get("predictions", [])
-            return all_predictions
-            
+            all_predictions, _ = self._fetch_predictions(week_num)
         except Exception as e:
             st.error(f"Error loading predictions for week {week_num}: {e}")
             return {} if not username else []
+        
+        if username:
+            user_data = all_predictions.get(username, {})
+            return user_data.get("predictions", [])
+        return all_predictions
     
     def calculate_points(self, prediction, actual_result):
         """Calculate points for a single match prediction"""
+        import pandas as pd
+        
         # Handle pandas Series properly
         if actual_result is None:
             return 0
@@ -259,31 +452,104 @@ class GitHubDataManager:
         except (ValueError, TypeError):
             return 0
         
-        points = 0
-        
         # Exact score
         if pred_home == actual_home and pred_away == actual_away:
             return POINTS_EXACT_SCORE
         
-        # Correct result (win/draw/loss)
-        pred_result = "draw" if pred_home == pred_away else ("home" if pred_home > pred_away else "away")
-        actual_result_outcome = "draw" if actual_home == actual_away else ("home" if actual_home > actual_away else "away")
+        pred_diff = pred_home - pred_away
+        actual_diff = actual_home - actual_away
         
-        if pred_result == actual_result_outcome:
-            points += POINTS_CORRECT_RESULT
+        # Correct result (win/draw/loss): the goal differences have the same sign
+        correct_result = (pred_diff > 0) - (pred_diff < 0) == (actual_diff > 0) - (actual_diff < 0)
         
         # Goal difference
+        same_difference = pred_diff == actual_diff
+        
+        return POINTS_CORRECT_RESULT * correct_result + POINTS_GOAL_DIFFERENCE * same_difference
+    
+    @staticmethod
+    def calculate_points_array(pred_home, pred_away, actual_home, actual_away):
+        """Vectorized calculate_points over arrays of scores
+        
+        Actual scores broadcast against predictions (e.g. users x matches).
+        Any NaN score, predicted or actual, is worth 0 points.
+        """
+        import numpy as np
+        
+        valid = ~(np.isnan(pred_home) | np.isnan(pred_away) | np.isnan(actual_home) | np.isnan(actual_away))
+        
+        exact = (pred_home == actual_home) & (pred_away == actual_away)
         pred_diff = pred_home - pred_away
         actual_diff = actual_home - actual_away
-        if pred_diff == actual_diff:
-            points += POINTS_GOAL_DIFFERENCE
+        correct_result = np.sign(pred_diff) == np.sign(actual_diff)
+        same_difference = pred_diff == actual_diff
+        
+        points = correct_result * POINTS_CORRECT_RESULT + same_difference * POINTS_GOAL_DIFFERENCE
+        points = np.where(exact, POINTS_EXACT_SCORE, points)
+        return np.where(valid, points, 0)
+    
+    def _leaderboard_is_current(self, current_week, cached_week, inputs):
+        """Whether a leaderboard scored from inputs (path -> blob sha) is still up to date
         
-        return points
+        inputs must cover users.json, the adjustments file and every completed
+        week's results, and each sha must still match the repo listing.
+        """
+        if cached_week != current_week:
+            return False
+        required = ["users.json", "manual_adjustments.json"]
+        required += [f"results/week{week}.csv" for week in range(1, current_week)]
+        if not all(path in inputs for path in required):
+            return False
+        files = self._list_repo_files()
+        return all(files.get(path) == sha for path, sha in inputs.items())
+    
+    def load_cached_leaderboard(self):
+        """Get the stored leaderboard if none of its inputs have changed, else None"""
+        try:
+            current_week = self.config.get_current_week()
+            content, _ = self._get_file_from_github(self.leaderboard_cache_file)
+            if not content:
+                return None
+            cached = json_loads(content)
+            if self._leaderboard_is_current(current_week, cached.get("current_week"), cached.get("inputs") or {}):
+                return cached.get("rows")
+        except Exception as e:
+            print(f"Error loading cached leaderboard: {e}")
+        return None
+    
+    def _save_cached_leaderboard(self, current_week, inputs, leaderboard):
+        """Store the computed leaderboard in the repo for the next cold start"""
+        try:
+            _, sha = self._get_file_from_github(self.leaderboard_cache_file, max_age=0)
+            self._save_file_to_github(
+                self.leaderboard_cache_file,
+                json_dumps({"current_week": current_week, "inputs": inputs, "rows": leaderboard}, indent=True, default=int),
+                "Update cached leaderboard",
+                sha
+            )
+        except Exception as e:
+            # Best effort - the leaderboard is just recomputed next time
+            print(f"Error saving cached leaderboard: {e}")
     
-    def get_leaderboard(self):
-        """Get leaderboard sorted by total points"""
-        user_scores = self.calculate_user_scores()
+    def get_leaderboard(self, week_scores=None):
+        """Get leaderboard sorted by total points
+        
+        The result is also written to leaderboard.cache.json so a fresh
+        process can use load_cached_leaderboard() instead of rescoring, and
+        kept for this process so while the inputs are unchanged the same list
+        is returned again (callers must not mutate it). Both only happen if
+        every input file was read - a leaderboard missing a week because of a
+        failed fetch is returned but never reused.
+        """
         current_week = self.config.get_current_week()
+        memo = self._leaderboard_memo
+        try:
+            if memo and self._leaderboard_is_current(current_week, memo[0], memo[1]):
+                return memo[2]
+        except Exception as e:
+            print(f"Error checking leaderboard inputs: {e}")
+        
+        user_scores, inputs, complete = self._score_users(current_week, week_scores)
         
         # Convert to list and sort by total points
         leaderboard = []
@@ -307,7 +573,11 @@ class GitHubDataManager:
                 "manual_adjustments": data.get("manual_adjustments", 0)
             })
         
-        return sorted(leaderboard, key=lambda x: x["total_points"], reverse=True)
+        leaderboard = sorted(leaderboard, key=lambda x: x["total_points"], reverse=True)
+        if complete:
+            self._save_cached_leaderboard(current_week, inputs, leaderboard)
+            self._leaderboard_memo = (current_week, inputs, leaderboard)
+        return leaderboard
     
     def has_user_predicted(self, username, week_num):
         """Check if user has already made predictions for a week"""
@@ -324,17 +594,16 @@ class GitHubDataManager:
                 return None
             
             # Combine predictions with fixtures
-            result = []
-            for i, (_, fixture) in enumerate(fixtures.iterrows()):
-                if i < len(predictions):
-                    result.append({
-                        "home_team": fixture['home_team'],
-                        "away_team": fixture['away_team'],
-                        "predicted_home_score": predictions[i]['home_score'],
-                        "predicted_away_score": predictions[i]['away_score']
-                    })
-                    
-            return result
+            teams = zip(fixtures['home_team'].tolist(), fixtures['away_team'].tolist())
+            return [
+                {
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "predicted_home_score": prediction['home_score'],
+                    "predicted_away_score": prediction['away_score']
+                }
+                for (home_team, away_team), prediction in zip(teams, predictions)
+            ]
         except Exception as e:
             print(f"Error getting user predictions for week {week_num}: {e}")
             return None
@@ -344,14 +613,12 @@ class GitHubDataManager:
         file_path = f"fixtures/week{week_num}.csv"
         try:
             csv_content = fixtures_df.to_csv(index=False)
-            commit_message = f"Add fixtures for Week {week_num}"
-            
-            # Check if file already exists
-            _, sha = self._get_file_from_github(file_path)
-            if sha:
-                commit_message = f"Update fixtures for Week {week_num}"
-            
-            self._save_file_to_github(file_path, csv_content, commit_message, sha)
+            self._replace_file(
+                file_path,
+                csv_content,
+                f"Add fixtures for Week {week_num}",
+                f"Update fixtures for Week {week_num}"
+            )
             return True
         except Exception as e:
             st.error(f"Error saving fixtures for week {week_num}: {e}")
@@ -362,20 +629,22 @@ class GitHubDataManager:
         file_path = f"results/week{week_num}.csv"
         
         csv_content = results_df.to_csv(index=False)
-        commit_message = f"Add results for Week {week_num}"
-        
-        # Check if file already exists
-        _, sha = self._get_file_from_github(file_path)
-        if sha:
-            commit_message = f"Update results for Week {week_num}"
         
         # Save to GitHub
-        self._save_file_to_github(file_path, csv_content, commit_message, sha)
-        
-        # Verify the save by attempting to load the file back
-        verification_content, _ = self._get_file_from_github(file_path)
-        if verification_content is None:
-            raise Exception("File was not saved to GitHub - verification failed")
+        response = self._replace_file(
+            file_path,
+            csv_content,
+            f"Add results for Week {week_num}",
+            f"Update results for Week {week_num}"
+        )
+        
+        # The PUT response carries the new blob SHA; only read the file back if it doesn't match
+        encoded = csv_content.encode('utf-8')
+        expected_sha = hashlib.sha1(b"blob %d\0" % len(encoded) + encoded).hexdigest()
+        if response.get('content', {}).get('sha') != expected_sha:
+            verification_content, _ = self._get_file_from_github(file_path, max_age=0)
+            if verification_content is None:
+                raise Exception("File was not saved to GitHub - verification failed")
         
         return True
     
@@ -409,13 +678,6 @@ class GitHubDataManager:
         adjustment_file = "manual_adjustments.json"
         
         try:
-            # Load existing adjustments
-            content, sha = self._get_file_from_github(adjustment_file)
-            if content:
-                adjustments = json.loads(content)
-            else:
-                adjustments = []
-            
             # Add new adjustment
             adjustment = {
                 "username": username,
@@ -425,11 +687,14 @@ class GitHubDataManager:
                 "timestamp": datetime.now().isoformat()
             }
             
-            adjustments.append(adjustment)
+            def build(content):
+                adjustments = json_loads(content) if content else []
+                adjustments.append(adjustment)
+                return json_dumps(adjustments, indent=True)
             
             # Save back to GitHub
             commit_message = f"Manual score adjustment: {username} {'+' if points_change > 0 else ''}{points_change} points"
-            self._save_file_to_github(adjustment_file, json.dumps(adjustments, indent=2), commit_message, sha)
+            self._read_modify_write(adjustment_file, build, commit_message)
             
             return True
             
@@ -437,24 +702,121 @@ class GitHubDataManager:
             st.error(f"Error saving manual adjustment: {e}")
             return False
     
+    def _fetch_adjustments(self):
+        """All manual adjustments as (list, blob sha), raising if the file can't be read
+        
+        The list is shared, so callers must not mutate it.
+        """
+        adjustment_file = "manual_adjustments.json"
+        content, sha = self._get_file_from_github(adjustment_file)
+        if not content:
+            return [], sha
+        # Parsed once per version of the file
+        return self._get_parsed(adjustment_file, content, json_loads), sha
+    
     def get_manual_adjustments(self, username=None):
         """Get manual score adjustments for a user or all users"""
-        adjustment_file = "manual_adjustments.json"
-        
         try:
-            content, _ = self._get_file_from_github(adjustment_file)
-            if content:
-                adjustments = json.loads(content)
-                if username:
-                    return [adj for adj in adjustments if adj['username'] == username]
-                return adjustments
-            return []
-        except Exception as e:
+            adjustments, _ = self._fetch_adjustments()
+        except Exception:
             return []
+        if username:
+            return [adj for adj in adjustments if adj['username'] == username]
+        return list(adjustments)
+    
+    def calculate_week_scores(self, week, usernames):
+        """Calculate each user's points for a single completed week
+        
+        Returns (scores, inputs). scores is a dict of username -> points, or
+        None if the week has no results or predictions yet; users who didn't
+        predict get the worst score among those who did. inputs maps each
+        file read to its blob sha (None if it doesn't exist). Raises if either
+        file can't be read, so a failed fetch is never mistaken for (or
+        cached as) an unscored week.
+        """
+        results, results_sha = self._fetch_results(week)
+        inputs = {f"results/week{week}.csv": results_sha}
+        if results is None or len(results) == 0:
+            return None, inputs  # Skip weeks without results
+        
+        predictions, predictions_sha = self._fetch_predictions(week)
+        inputs[f"predictions/week{week}.json"] = predictions_sha
+        if not predictions:
+            return None, inputs  # Skip if no predictions found
+        
+        import numpy as np
+        import pandas as pd
+        
+        # Actual scores as float arrays (NaN where a result is missing), truncated like int(float(x))
+        actual_home = np.trunc(pd.to_numeric(results['home_score'], errors='coerce').to_numpy(dtype=float))
+        actual_away = np.trunc(pd.to_numeric(results['away_score'], errors='coerce').to_numpy(dtype=float))
+        n_matches = len(results)
+        
+        # First pass: gather predictions for users who made them into a users x matches grid
+        predicted_users = []
+        pred_home = []
+        pred_away = []
+        
+        for username in usernames:
+            if username in predictions:
+                user_data = predictions[username]
+                
+                # Handle both old and new prediction formats
+                if isinstance(user_data, dict) and "predictions" in user_data:
+                    user_predictions = user_data["predictions"]
+                elif isinstance(user_data, list):
+                    user_predictions = user_data
+                else:
+                    continue
+                
+                # Matches without a prediction stay NaN and score nothing
+                home_row = np.full(n_matches, np.nan)
+                away_row = np.full(n_matches, np.nan)
+                for i, pred in enumerate(user_predictions[:n_matches]):
+                    home_row[i] = pred.get('home_score', 0)
+                    away_row[i] = pred.get('away_score', 0)
+                
+                predicted_users.append(username)
+                pred_home.append(home_row)
+                pred_away.append(away_row)
+        
+        weekly_scores = {}
+        if predicted_users:
+            points = self.calculate_points_array(np.array(pred_home), np.array(pred_away), actual_home, actual_away)
+            weekly_scores = dict(zip(predicted_users, points.sum(axis=1).astype(int).tolist()))
+        
+        # Find the worst score among users who predicted
+        worst_score = 0
+        if weekly_scores:
+            worst_score = min(weekly_scores.values())
+        
+        # Second pass: users who didn't make predictions get the worst score
+        return {username: weekly_scores.get(username, worst_score) for username in usernames}, inputs
+    
+    def calculate_user_scores(self, week_scores=None):
+        """Calculate scores for all users across all completed weeks, including manual adjustments
+        
+        week_scores optionally maps week number to precomputed
+        calculate_week_scores() output (None for a week with no results file)
+        so finished weeks aren't rescored.
+        """
+        return self._score_users(self.config.get_current_week(), week_scores)[0]
     
-    def calculate_user_scores(self):
-        """Calculate scores for all users across all completed weeks, including manual adjustments"""
-        users = self.config.get_users()
+    def _score_users(self, current_week, week_scores=None):
+        """calculate_user_scores(), plus what the scores were computed from
+        
+        Returns (user_scores, inputs, complete). inputs maps every file the
+        scores depend on to the blob sha that was read (None if it doesn't
+        exist). complete is False if any of them couldn't be read, in which
+        case user_scores is missing that data.
+        """
+        complete = True
+        inputs = {}
+        try:
+            users, inputs["users.json"] = self.config.get_users_with_sha()
+        except Exception as e:
+            st.error(f"Error loading users: {e}")
+            users, complete = {}, False
         user_scores = {}
         
         # Initialize scores
@@ -468,71 +830,67 @@ class GitHubDataManager:
                     "manual_adjustments": 0
                 }
         
-        current_week = self.config.get_current_week()
+        usernames = list(user_scores)
+        missing = [week for week in range(1, current_week) if week_scores is None or week not in week_scores]
+        computed = {}
+        
+        # A week without both a results and a predictions file scores nothing, so
+        # check the repo listing (one cached call) before reading anything
+        try:
+            files = self._list_repo_files()
+            for week in missing:
+                paths = (f"results/week{week}.csv", f"predictions/week{week}.json")
+                if not all(path in files for path in paths):
+                    computed[week] = (None, {path: files.get(path) for path in paths})
+        except Exception as e:
+            print(f"Error listing repo files, scoring every week: {e}")
+        
+        # Fetch the rest concurrently, then score them on this thread from the warm cache,
+        # so st.error and friends are never called from a worker thread
+        to_score = [week for week in missing if week not in computed]
+        if to_score:
+            paths = [path for week in to_score for path in (f"results/week{week}.csv", f"predictions/week{week}.json")]
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                list(executor.map(self._prefetch, paths))
+            for week in to_score:
+                try:
+                    computed[week] = self.calculate_week_scores(week, usernames)
+                except Exception as e:
+                    st.error(f"Error scoring week {week}: {e}")
+                    computed[week] = (None, {})
+                    complete = False
         
         # Calculate points for each completed week (only previous weeks, not current week)
         for week in range(1, current_week):
-            results = self.load_results(week)
-            if results is None or len(results) == 0:
-                continue  # Skip weeks without results
-            
-            predictions = self.load_predictions(week)
-            if not predictions:
-                continue  # Skip if no predictions found
-            
-            # First pass: calculate scores for users who made predictions
-            weekly_scores = {}
-            users_who_predicted = []
-            
-            for username in user_scores:
-                if username in predictions:
-                    week_points = 0
-                    user_data = predictions[username]
-                    
-                    # Handle both old and new prediction formats
-                    if isinstance(user_data, dict) and "predictions" in user_data:
-                        user_predictions = user_data["predictions"]
-                    elif isinstance(user_data, list):
-                        user_predictions = user_data
-                    else:
-                        continue
-                    
-                    # Calculate points for each match
-                    for i, result_row in results.iterrows():
-                        if i < len(user_predictions):
-                            points = self.calculate_points(user_predictions[i], result_row)
-                            week_points += points
-                    
-                    weekly_scores[username] = week_points
-                    users_who_predicted.append(username)
-            
-            # Find the worst score among users who predicted
-            worst_score = 0
-            if weekly_scores:
-                worst_score = min(weekly_scores.values())
+            week_result = computed[week] if week in computed else week_scores[week]
+            if week_result is None:
+                # Caller found no results file for this week
+                inputs[f"results/week{week}.csv"] = None
+                continue
+            scores, week_inputs = week_result
+            inputs.update(week_inputs)
+            if scores is None:
+                continue
             
-            # Second pass: assign scores to all users
             for username in user_scores:
-                if username in weekly_scores:
-                    # User made predictions - use their calculated score
-                    week_points = weekly_scores[username]
-                else:
-                    # User didn't make predictions - give them the worst score
-                    week_points = worst_score
-                
+                week_points = scores.get(username, 0)
                 user_scores[username]["total_points"] += week_points
                 user_scores[username]["weeks_played"] += 1
                 user_scores[username]["weekly_breakdown"][f"week_{week}"] = week_points
         
         # Add manual adjustments
-        all_adjustments = self.get_manual_adjustments()
+        try:
+            all_adjustments, inputs["manual_adjustments.json"] = self._fetch_adjustments()
+        except Exception as e:
+            st.error(f"Error loading manual adjustments: {e}")
+            all_adjustments, complete = [], False
         for adjustment in all_adjustments:
             username = adjustment['username']
             if username in user_scores:
                 user_scores[username]["total_points"] += adjustment['points_change']
                 user_scores[username]["manual_adjustments"] += adjustment['points_change']
         
-        return user_scores
+        return user_scores, inputs, complete
     
     def export_predictions_to_excel(self, week_num):
         """Export all predictions for a week to an Excel file"""
@@ -544,77 +902,82 @@ class GitHubDataManager:
             if not predictions or fixtures is None:
                 return None
             
-            # Create a workbook and worksheet
+            import pandas as pd
             from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
             from openpyxl.styles import Font, Alignment, PatternFill
-            
-            wb = Workbook()
-            ws = wb.active
-            ws.title = f"Week {week_num} Predictions"
-            
-            # Headers
-            headers = ["Match", "Home Team", "Away Team"]
+            from openpyxl.utils import get_column_letter
             
             # Get all users who made predictions
-            users = list(predictions.keys())
-            if "admin" in users:
-                users.remove("admin")  # Remove admin from export
+            users = [username for username in predictions if username != "admin"]  # Remove admin from export
+            all_users = self.config.get_users()
             
-            # Add user columns
+            # Flatten every user's predictions into one long frame
+            n_matches = len(fixtures)
+            rows = []
             for username in users:
-                user_info = self.config.get_users().get(username, {})
-                display_name = user_info.get("display_name", username)
-                headers.append(display_name)
+                user_data = predictions.get(username, {})
+                if isinstance(user_data, dict) and "predictions" in user_data:
+                    user_predictions = user_data["predictions"]
+                elif isinstance(user_data, list):
+                    user_predictions = user_data
+                else:
+                    user_predictions = []
+                
+                for match_idx, pred in enumerate(user_predictions[:n_matches]):
+                    rows.append((username, match_idx, pred.get('home_score', 0), pred.get('away_score', 0)))
             
-            # Write headers
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
+            long_df = pd.DataFrame(rows, columns=["username", "match_idx", "home_score", "away_score"])
+            long_df["prediction"] = long_df["home_score"].astype(str) + "-" + long_df["away_score"].astype(str)
             
-            # Write match data
-            for match_idx, (_, fixture) in enumerate(fixtures.iterrows()):
-                row = match_idx + 2
-                
-                # Match info
-                ws.cell(row=row, column=1, value=match_idx + 1)
-                ws.cell(row=row, column=2, value=fixture['home_team'])
-                ws.cell(row=row, column=3, value=fixture['away_team'])
-                
-                # User predictions
-                for user_idx, username in enumerate(users):
-                    col = user_idx + 4
-                    
-                    user_data = predictions.get(username, {})
-                    if isinstance(user_data, dict) and "predictions" in user_data:
-                        user_predictions = user_data["predictions"]
-                    elif isinstance(user_data, list):
-                        user_predictions = user_data
-                    else:
-                        user_predictions = []
-                    
-                    if match_idx < len(user_predictions):
-                        pred = user_predictions[match_idx]
-                        prediction_text = f"{pred.get('home_score', 0)}-{pred.get('away_score', 0)}"
-                        ws.cell(row=row, column=col, value=prediction_text)
-                        ws.cell(row=row, column=col).alignment = Alignment(horizontal="center")
-                    else:
-                        ws.cell(row=row, column=col, value="No prediction")
-                        ws.cell(row=row, column=col).alignment = Alignment(horizontal="center")
+            # One column per user, one row per match
+            grid = (long_df.pivot(index="match_idx", columns="username", values="prediction")
+                    .reindex(index=range(n_matches), columns=users)
+                    .fillna("No prediction"))
+            
+            table = pd.DataFrame({
+                "Match": range(1, n_matches + 1),
+                "Home Team": fixtures['home_team'].to_numpy(),
+                "Away Team": fixtures['away_team'].to_numpy(),
+            })
+            table = pd.concat([table, grid.reset_index(drop=True)], axis=1)
             
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 20)
-                ws.column_dimensions[column_letter].width = adjusted_width
+            # Headers
+            headers = ["Match", "Home Team", "Away Team"]
+            headers += [all_users.get(username, {}).get("display_name", username) for username in users]
+            
+            # Create a write-only workbook so rows stream out instead of being held as cells
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(f"Week {week_num} Predictions")
+            
+            # Auto-adjust column widths (must be set before any rows are written)
+            for col_idx, column in enumerate(table.columns, 1):
+                # An empty column's max() is NaN, so only measure cells if there are any
+                longest_cell = 0 if table.empty else int(table[column].astype(str).str.len().max())
+                max_length = max(len(str(headers[col_idx - 1])), longest_cell)
+                ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 20)
+            
+            header_font = Font(bold=True)
+            header_fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            center = Alignment(horizontal="center")
+            
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = center
+                header_cells.append(cell)
+            ws.append(header_cells)
+            
+            # Write match data
+            for row in table.itertuples(index=False):
+                prediction_cells = []
+                for value in row[3:]:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.alignment = center
+                    prediction_cells.append(cell)
+                ws.append(list(row[:3]) + prediction_cells)
             
             return wb
             